@@ -1,19 +1,25 @@
 """
 Authentication dependencies - Fixed version.
 """
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from uuid import uuid4
+from sqlalchemy import bindparam, lambda_stmt, select
+import hashlib
+import time
 
 from ..config import settings
+from ..core.audit_queue import get_audit_queue
+from ..core.server_timing import timed
 from ..database import get_db
-from ..models import User, AuditLog
+from ..models import Company, User
+from ..models.company import BusinessSector
 from ..models.user import UserRole
 
 # Password hashing
@@ -23,6 +29,24 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 
+@dataclass(frozen=True)
+class _AdminIdentity:
+    """Plain fields of a resolved admin user, safe to share between requests."""
+    user_id: str
+    company_id: Optional[str]
+    role: UserRole
+    is_active: bool
+
+
+# Resolved admin users keyed by token hash, so admin-polled endpoints don't
+# hit the users table on every call. Only plain fields are cached; each
+# request gets its own User built from them. Role or status changes take
+# effect once the entry expires.
+ADMIN_CACHE_TTL_SECONDS = 60
+ADMIN_CACHE_MAX_SIZE = 10_000
+_admin_user_cache: Dict[str, Tuple[float, _AdminIdentity]] = {}
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -55,9 +79,8 @@ def create_refresh_token(data: dict):
 
 
 async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
-    """Get user by ID."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+    """Get user by ID (served from the session identity map when loaded)."""
+    return await db.get(User, user_id)
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
@@ -138,8 +161,67 @@ async def require_manager(
     return current_user
 
 
-async def create_audit_log(
-    db: AsyncSession,
+@dataclass(frozen=True)
+class CompanySummary:
+    """Read-only company fields used by report endpoints."""
+    id: str
+    name: str
+    main_location: Optional[str]
+    business_sector: Optional[BusinessSector]
+    description: Optional[str]
+    esg_scoping_completed: Optional[bool]
+    scoping_completed_at: Optional[datetime]
+    scoping_data: Optional[Dict[str, Any]]
+    data_version: int
+
+
+# Built once and cached by code location, so per-request calls skip both
+# statement construction and the compiled-SQL cache key computation
+_COMPANY_SUMMARY_STMT = lambda_stmt(
+    lambda: select(
+        Company.id,
+        Company.name,
+        Company.main_location,
+        Company.business_sector,
+        Company.description,
+        Company.esg_scoping_completed,
+        Company.scoping_completed_at,
+        Company.scoping_data,
+        Company.data_version
+    ).where(Company.id == bindparam("company_id"))
+)
+
+
+async def get_company_summary(db: AsyncSession, company_id: str) -> Optional[CompanySummary]:
+    """Fetch a company's report fields as plain columns, or None."""
+    # No ORM identity map entry or relationship state is built for the row
+    result = await db.execute(_COMPANY_SUMMARY_STMT, {"company_id": company_id})
+    row = result.one_or_none()
+    return CompanySummary(**row._mapping) if row is not None else None
+
+
+async def get_authorized_company(
+    company_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> CompanySummary:
+    """Load the company from the path, requiring it to be the user's own."""
+    # Malformed ids are rejected with 422 during path validation; ids are
+    # stored in canonical lowercase form, which str(UUID) produces
+    company = None
+    if str(company_id) == current_user.company_id:
+        with timed("auth"):
+            company = await get_company_summary(db, current_user.company_id)
+    
+    if company is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found or access denied"
+        )
+    return company
+
+
+def create_audit_log(
     user_id: str,
     action: str,
     resource_type: Optional[str] = None,
@@ -147,28 +229,65 @@ async def create_audit_log(
     details: Optional[dict] = None,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None
-):
-    """Create an audit log entry."""
-    audit_log = AuditLog(
-        id=str(uuid4()),
+) -> None:
+    """Queue an audit log entry; the audit worker writes it in the next batch."""
+    get_audit_queue().enqueue(
         user_id=user_id,
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
         details=details,
         ip_address=ip_address,
-        user_agent=user_agent,
-        timestamp=datetime.utcnow()
+        user_agent=user_agent
     )
-    db.add(audit_log)
-    await db.commit()
-    return audit_log
 
 
 async def get_admin_user(
-    current_user: User = Depends(require_admin)
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ) -> User:
-    """Get admin user (alias for require_admin)."""
+    """Get admin user, reusing a recent lookup for the same token."""
+    # Always verify signature and expiry; only the database lookup is cached
+    try:
+        jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    now = time.monotonic()
+    cached = _admin_user_cache.get(token_hash)
+    if cached is not None and cached[0] > now:
+        identity = cached[1]
+        # Transient, per-request instance; never attached to a session
+        return await require_admin(User(
+            id=identity.user_id,
+            company_id=identity.company_id,
+            role=identity.role,
+            is_active=identity.is_active
+        ))
+    
+    current_user = await require_admin(await get_current_user(token, db))
+    
+    if len(_admin_user_cache) >= ADMIN_CACHE_MAX_SIZE:
+        # Drop expired entries first; fall back to clearing if still full
+        for key in [k for k, (expires, _) in _admin_user_cache.items() if expires <= now]:
+            del _admin_user_cache[key]
+        if len(_admin_user_cache) >= ADMIN_CACHE_MAX_SIZE:
+            _admin_user_cache.clear()
+    _admin_user_cache[token_hash] = (
+        now + ADMIN_CACHE_TTL_SECONDS,
+        _AdminIdentity(
+            user_id=current_user.id,
+            company_id=current_user.company_id,
+            role=current_user.role,
+            is_active=current_user.is_active
+        )
+    )
+    
     return current_user
 
 
@@ -6,8 +6,9 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists
 from uuid import uuid4
+import logging
 
 from ..database import get_db
 from ..schemas.users import UserCreate, UserResponse, Token, UserUpdate, AuthResponse
@@ -26,15 +27,14 @@ from .dependencies import (
 )
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
 @router.post("/register-debug")
 async def debug_register_request(request: Request):
     """Debug endpoint to see what the frontend is sending."""
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
         body = await request.body()
         headers = dict(request.headers)
@@ -53,18 +53,15 @@ async def register_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Register a new user and company."""
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
         logger.info(f"Registration attempt for email: {user_data.email}")
         logger.info(f"Business sector: {user_data.business_sector}")
         logger.info(f"Company name: {user_data.company_name}")
         # Check if user already exists
-        existing_user = await db.execute(
-            select(User).where(User.email == user_data.email)
+        user_exists = await db.scalar(
+            select(exists().where(User.email == user_data.email))
         )
-        if existing_user.scalar_one_or_none():
+        if user_exists:
             logger.warning(f"User already exists: {user_data.email}")
             raise HTTPException(
                 status_code=400,
@@ -105,11 +102,9 @@ async def register_user(
         
         db.add(user)
         await db.commit()
-        await db.refresh(user)
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=user.id,
             action="user_register",
             resource_type="user",
@@ -133,16 +128,7 @@ async def register_user(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
-            user=UserResponse(
-                id=user.id,
-                email=user.email,
-                full_name=user.full_name,
-                role=user.role,
-                company_id=user.company_id,
-                is_active=user.is_active,
-                is_verified=user.is_verified,
-                created_at=user.created_at
-            )
+            user=UserResponse.model_validate(user)
         )
         
     except Exception as e:
@@ -186,8 +172,7 @@ async def login(
     await db.commit()
     
     # Create audit log
-    await create_audit_log(
-        db=db,
+    create_audit_log(
         user_id=user.id,
         action="user_login",
         resource_type="user",
@@ -199,16 +184,7 @@ async def login(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
-        user=UserResponse(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            role=user.role,
-            company_id=user.company_id,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at
-        )
+        user=UserResponse.model_validate(user)
     )
 
 
@@ -217,16 +193,7 @@ async def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user information."""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        full_name=current_user.full_name,
-        role=current_user.role,
-        company_id=current_user.company_id,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at
-    )
+    return UserResponse.model_validate(current_user)
 
 
 @router.put("/me", response_model=UserResponse)
@@ -245,11 +212,9 @@ async def update_current_user(
             current_user.hashed_password = get_password_hash(user_update.password)
         
         await db.commit()
-        await db.refresh(current_user)
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=current_user.id,
             action="user_update",
             resource_type="user",
@@ -257,16 +222,7 @@ async def update_current_user(
             details={"updated_fields": user_update.dict(exclude_unset=True)}
         )
         
-        return UserResponse(
-            id=current_user.id,
-            email=current_user.email,
-            full_name=current_user.full_name,
-            role=current_user.role,
-            company_id=current_user.company_id,
-            is_active=current_user.is_active,
-            is_verified=current_user.is_verified,
-            created_at=current_user.created_at
-        )
+        return UserResponse.model_validate(current_user)
         
     except Exception as e:
         await db.rollback()
@@ -282,10 +238,10 @@ async def invite_user(
     """Invite a new user to the company (Manager/Admin only)."""
     try:
         # Check if user already exists
-        existing_user = await db.execute(
-            select(User).where(User.email == user_data.email)
+        user_exists = await db.scalar(
+            select(exists().where(User.email == user_data.email))
         )
-        if existing_user.scalar_one_or_none():
+        if user_exists:
             raise HTTPException(
                 status_code=400,
                 detail="User with this email already exists"
@@ -306,11 +262,9 @@ async def invite_user(
         
         db.add(user)
         await db.commit()
-        await db.refresh(user)
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=current_user.id,
             action="user_invite",
             resource_type="user",
@@ -322,16 +276,7 @@ async def invite_user(
             }
         )
         
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            role=user.role,
-            company_id=user.company_id,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at
-        )
+        return UserResponse.model_validate(user)
         
     except Exception as e:
         await db.rollback()
@@ -345,8 +290,7 @@ async def logout(
     db: AsyncSession = Depends(get_db)
 ):
     """Logout user (create audit log)."""
-    await create_audit_log(
-        db=db,
+    create_audit_log(
         user_id=current_user.id,
         action="user_logout",
         resource_type="user",
@@ -0,0 +1,138 @@
+"""
+Background queue for audit log writes.
+
+Endpoints enqueue audit entries instead of adding and committing them in the
+request path; a single worker drains the queue and bulk-inserts whatever has
+accumulated every AUDIT_FLUSH_INTERVAL_SECONDS (or every AUDIT_BATCH_SIZE
+entries, whichever comes first). The worker starts with the application, or
+with the first entry if nothing started it; the queue holds at most
+AUDIT_QUEUE_MAX_SIZE entries.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from ..database import AsyncSessionLocal
+from ..models.audit import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.1
+AUDIT_QUEUE_MAX_SIZE = 10_000
+
+# Put on the queue by stop() so the worker exits after writing what precedes it
+_STOP = None
+
+
+class AuditLogQueue:
+    """Collects audit log rows and writes them in batches."""
+
+    def __init__(self):
+        """Initialize an empty queue; the worker starts with start()."""
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAX_SIZE)
+        self._worker: Optional[asyncio.Task] = None
+
+    def enqueue(self, **fields: Any) -> None:
+        """Queue one audit log row; fields are AuditLog column values."""
+        fields.setdefault("id", str(uuid4()))
+        fields.setdefault("timestamp", datetime.utcnow())
+
+        if self._worker is None or self._worker.done():
+            try:
+                self.start()
+            except RuntimeError:
+                # No running event loop; the entry waits for start()
+                pass
+
+        try:
+            self._queue.put_nowait(fields)
+        except asyncio.QueueFull:
+            logger.error(f"Audit log queue full, dropping {fields.get('action')} entry {fields['id']}")
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush every queued entry."""
+        if self._worker is not None and not self._worker.done():
+            await self._queue.put(_STOP)
+            await self._worker
+        self._worker = None
+
+        # Anything enqueued after the sentinel (or with no worker running)
+        remaining = self._drain()
+        if remaining:
+            await self._write(remaining)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        """Take every entry currently on the queue without waiting."""
+        batch = []
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not _STOP:
+                batch.append(entry)
+        return batch
+
+    async def _run(self) -> None:
+        """Worker loop: wait for an entry, collect a batch, insert it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                return
+
+            batch = [entry]
+            stopping = False
+            deadline = loop.time() + AUDIT_FLUSH_INTERVAL_SECONDS
+            while len(batch) < AUDIT_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch of audit rows, falling back to one row at a time."""
+        try:
+            await self._insert(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                # Audit entries must never take the worker down with them
+                entry = batch[0]
+                logger.error(f"Failed to write {entry.get('action')} audit log entry {entry['id']}: {e}")
+                return
+
+            # Keep one bad row (e.g. a dangling user_id) from losing the rest
+            logger.warning(f"Failed to write {len(batch)} audit log entries as a batch, retrying individually: {e}")
+            for entry in batch:
+                await self._write([entry])
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows in one statement and transaction."""
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(AuditLog), rows)
+            await session.commit()
+
+
+@lru_cache(maxsize=1)
+def get_audit_queue() -> AuditLogQueue:
+    """Return the process-wide audit log queue."""
+    return AuditLogQueue()
@@ -6,6 +6,7 @@ import os
 import shutil
 import zipfile
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import logging
 import json
@@ -299,9 +300,8 @@ class BackupManager:
         restore_dir.mkdir(exist_ok=True)
         
         try:
-            # Extract backup
-            with zipfile.ZipFile(backup_file, 'r') as archive:
-                archive.extractall(restore_dir)
+            # Extract backup off the event loop; decompression is CPU-bound
+            await asyncio.to_thread(self._extract_archive, backup_file, restore_dir)
             
             # Read metadata
             metadata_path = restore_dir / "metadata.json"
@@ -341,6 +341,11 @@ class BackupManager:
                 shutil.rmtree(restore_dir)
             raise
     
+    def _extract_archive(self, backup_file: Path, restore_dir: Path):
+        """Extract a backup archive into the restore directory."""
+        with zipfile.ZipFile(backup_file, 'r') as archive:
+            archive.extractall(restore_dir)
+    
     async def _restore_database(self, sql_file: Path):
         """Restore database from SQL dump."""
         async with AsyncSessionLocal() as db:
@@ -392,7 +397,7 @@ class DisasterRecoveryManager:
     
     def __init__(self):
         """Initialize disaster recovery manager."""
-        self.backup_manager = BackupManager()
+        self.backup_manager = get_backup_manager()
     
     async def create_disaster_recovery_plan(self) -> Dict[str, Any]:
         """Create disaster recovery plan document."""
@@ -524,11 +529,29 @@ class DisasterRecoveryManager:
             return test_results
 
 
+@lru_cache(maxsize=1)
+def get_backup_manager() -> BackupManager:
+    """
+    Return the process-wide BackupManager.
+    
+    BackupManager only holds configuration (paths and retention policy)
+    and keeps no per-call state, so one instance is shared by every
+    request and background job.
+    """
+    return BackupManager()
+
+
+@lru_cache(maxsize=1)
+def get_disaster_recovery_manager() -> DisasterRecoveryManager:
+    """Return the process-wide DisasterRecoveryManager."""
+    return DisasterRecoveryManager()
+
+
 # Scheduled backup function
 async def scheduled_backup():
     """Scheduled backup job."""
     try:
-        backup_manager = BackupManager()
+        backup_manager = get_backup_manager()
         result = await backup_manager.create_full_backup(include_files=True)
         logger.info(f"Scheduled backup completed: {result['archive_path']}")
         return result
@@ -541,7 +564,7 @@ async def scheduled_backup():
 async def backup_health_check() -> Dict[str, Any]:
     """Check backup system health."""
     try:
-        backup_manager = BackupManager()
+        backup_manager = get_backup_manager()
         backups = await backup_manager.list_backups()
         
         # Check if we have recent backups
@@ -0,0 +1,23 @@
+"""
+Per-company data version counter.
+
+Company.data_version is incremented in the same transaction as every write
+to a company row, its tasks or their evidence. ETags and cache keys use it
+instead of updated_at, since two writes can share a timestamp.
+"""
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Company
+
+# For UPDATEs of the company row itself: .values(data_version=NEXT_DATA_VERSION)
+NEXT_DATA_VERSION = Company.data_version + 1
+
+
+async def bump_data_version(db: AsyncSession, company_id: str) -> None:
+    """Increment a company's data version as part of the current transaction."""
+    await db.execute(
+        update(Company)
+        .where(Company.id == company_id)
+        .values(data_version=NEXT_DATA_VERSION)
+    )
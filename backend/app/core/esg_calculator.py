@@ -5,6 +5,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 
 class ESGCategory(str, Enum):
@@ -405,35 +406,25 @@ class ESGCalculator:
         Returns:
             List[ComplianceRate]: Compliance rates by framework
         """
-        compliance_rates = []
+        # Tally every framework in one pass over the tasks rather than
+        # filtering the whole task list once per framework
+        counts: Dict[str, List[int]] = {}
+        for task in tasks:
+            completed = task.get("status") == "completed"
+            # A framework listed twice on one task still counts the task once
+            for framework in set(task.get("frameworks") or ()):
+                framework_counts = counts.setdefault(framework, [0, 0])
+                framework_counts[0] += completed
+                framework_counts[1] += 1
         
+        compliance_rates = []
         for framework in frameworks:
-            framework_tasks = [
-                task for task in tasks
-                if framework in task.get("frameworks", [])
-            ]
-            
-            if not framework_tasks:
-                compliance_rates.append(ComplianceRate(
-                    framework=framework,
-                    rate=0.0,
-                    completed=0,
-                    total=0
-                ))
-                continue
-            
-            completed_tasks = [
-                task for task in framework_tasks
-                if task.get("status") == "completed"
-            ]
-            
-            rate = (len(completed_tasks) / len(framework_tasks)) * 100
-            
+            completed, total = counts.get(framework, (0, 0))
             compliance_rates.append(ComplianceRate(
                 framework=framework,
-                rate=rate,
-                completed=len(completed_tasks),
-                total=len(framework_tasks)
+                rate=(completed / total) * 100 if total else 0.0,
+                completed=completed,
+                total=total
             ))
         
         return compliance_rates
@@ -533,4 +524,15 @@ class ESGCalculator:
         elif actual_value <= benchmarks["average"]:
             return "average"
         else:
-            return "inefficient"
\ No newline at end of file
+            return "inefficient"
+
+
+@lru_cache(maxsize=1)
+def get_esg_calculator() -> ESGCalculator:
+    """
+    Return the process-wide ESGCalculator.
+    
+    Emission factors and benchmarks are class constants and no method keeps
+    state between calls, so one instance serves every request.
+    """
+    return ESGCalculator()
@@ -0,0 +1,50 @@
+"""
+ETag helpers for conditional GET requests.
+
+Endpoints derive a weak ETag from a cheap version key (timestamps and counts
+they already fetch) and answer 304 Not Modified when the client's
+If-None-Match still matches, skipping payload construction and serialization.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Per-user data: browsers may store it but must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+# Reference data identical for every caller; shared caches may serve it for
+# an hour and keep serving a stale copy for a day while revalidating
+PUBLIC_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values that determine a response."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/ prefixes are ignored on both sides
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+def set_etag(response: Response, etag: str, cache_control: str = CACHE_CONTROL) -> None:
+    """Attach validator headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str = CACHE_CONTROL) -> Response:
+    """Build an empty 304 response for a matching ETag."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -3,9 +3,11 @@ ESG content parser for dynamic task generation from markdown files.
 """
 import markdown
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+import os
 import re
 import logging
 
@@ -34,13 +36,27 @@ class ESGContentParser:
         """Initialize parser with content file path."""
         self.content_file_path = content_file_path or settings.esg_content_file
         self._content_cache = None
+        self._content_mtime = None
+        # Parsed results keyed by (method, sector); cleared when the file changes
+        self._parse_cache: Dict[Tuple[str, Optional[str]], Any] = {}
         self.md = markdown.Markdown(extensions=['tables', 'extra'])
     
     def load_content_file(self) -> str:
         """Load markdown content from file with caching."""
+        if self._content_cache is not None:
+            # Reload if the file was edited since it was cached
+            try:
+                mtime = os.stat(self.content_file_path).st_mtime
+            except OSError:
+                mtime = self._content_mtime
+            if mtime != self._content_mtime:
+                self._content_cache = None
+                self._parse_cache.clear()
+        
         if self._content_cache is None:
             try:
                 with open(self.content_file_path, 'r', encoding='utf-8') as file:
+                    self._content_mtime = os.fstat(file.fileno()).st_mtime
                     self._content_cache = file.read()
                 logger.info(f"Loaded ESG content from {self.content_file_path}")
             except FileNotFoundError:
@@ -52,6 +68,20 @@ class ESGContentParser:
         
         return self._content_cache
     
+    @property
+    def content_version(self) -> Optional[float]:
+        """Modification time of the loaded content file, usable as a cache validator."""
+        self.load_content_file()
+        return self._content_mtime
+    
+    def _cached(self, method: str, sector: Optional[str], compute: Callable[[], Any]) -> Any:
+        """Return a memoized parse result, computing it on first use."""
+        self.load_content_file()  # Drops stale results if the file changed
+        key = (method, sector)
+        if key not in self._parse_cache:
+            self._parse_cache[key] = compute()
+        return self._parse_cache[key]
+    
     def parse_sector_content(self, sector: BusinessSector) -> List[ESGQuestion]:
         """
         Parse sector-specific ESG content from markdown file.
@@ -340,6 +370,9 @@ class ESGContentParser:
     
     def get_available_sectors(self) -> List[str]:
         """Get list of available business sectors from content."""
+        return self._cached("sectors", None, self._get_available_sectors)
+    
+    def _get_available_sectors(self) -> List[str]:
         content = self.load_content_file()
         
         # Extract sector headers using regex
@@ -374,6 +407,9 @@ class ESGContentParser:
         Returns:
             List of structured questions with metadata
         """
+        return self._cached("questions", sector, lambda: self._parse_sector_questions(sector))
+    
+    def _parse_sector_questions(self, sector: str) -> List[Dict]:
         content = self.load_content_file()
         
         # Find sector section
@@ -400,7 +436,7 @@ class ESGContentParser:
         sector_content = sector_match.group(0)
         
         # Convert to HTML and parse table
-        html_content = self.md.convert(sector_content)
+        html_content = self.md.reset().convert(sector_content)
         soup = BeautifulSoup(html_content, 'html.parser')
         
         table = soup.find('table')
@@ -442,6 +478,31 @@ class ESGContentParser:
         
         return questions
     
+    def get_sector_payload(self, sector: str) -> Dict[str, Any]:
+        """
+        Get a sector's questions grouped by category, with its frameworks.
+        
+        The result is built once per content version and shared between
+        callers, so it must not be mutated.
+        """
+        return self._cached("payload", sector, lambda: self._build_sector_payload(sector))
+    
+    def _build_sector_payload(self, sector: str) -> Dict[str, Any]:
+        questions = self.parse_sector_questions(sector)
+        
+        # Group questions by category for better UX
+        grouped_questions: Dict[str, List[Dict]] = {}
+        for question in questions:
+            grouped_questions.setdefault(question.get("category", "General"), []).append(question)
+        
+        return {
+            "sector": sector,
+            "total_questions": len(questions),
+            "categories": list(grouped_questions.keys()),
+            "questions_by_category": grouped_questions,
+            "frameworks": self.get_sector_frameworks(sector)
+        }
+    
     def _infer_question_type(self, question_text: str) -> str:
         """Infer question type from question text."""
         question_lower = question_text.lower()
@@ -459,6 +520,9 @@ class ESGContentParser:
     
     def get_sector_frameworks(self, sector: str) -> List[str]:
         """Get frameworks applicable to a sector."""
+        return self._cached("frameworks", sector, lambda: self._get_sector_frameworks(sector))
+    
+    def _get_sector_frameworks(self, sector: str) -> List[str]:
         content = self.load_content_file()
         
         # Find frameworks section for sector
@@ -498,4 +562,10 @@ class ESGContentParser:
                     cleaned_framework = self._clean_framework_name(raw_framework)
                     frameworks.append(cleaned_framework)
         
-        return frameworks
\ No newline at end of file
+        return frameworks
+
+
+@lru_cache(maxsize=1)
+def get_content_parser() -> ESGContentParser:
+    """Get the shared parser for the configured ESG content file."""
+    return ESGContentParser()
@@ -2,7 +2,9 @@
 Improved ESG Report Generator that creates professional PDF reports.
 """
 from typing import Dict, List, Any, Optional
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 import base64
 from reportlab.lib import colors
@@ -38,8 +40,6 @@ class ESGPDFReportGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
-        self.toc = TableOfContents()
-        self.page_number = 1
         
     def _setup_custom_styles(self):
         """Set up custom paragraph styles for the report."""
@@ -149,7 +149,8 @@ class ESGPDFReportGenerator:
         
         # Table of contents
         story.append(Paragraph("Table of Contents", self.styles['SectionHeader']))
-        story.append(self.toc)
+        # Built per report: a TableOfContents collects entries during build
+        story.append(TableOfContents())
         story.append(PageBreak())
         
         # Executive summary
@@ -488,16 +489,10 @@ class ESGPDFReportGenerator:
         elements.append(Paragraph("Task Analysis & Progress", self.styles['SectionHeader']))
         
         # Task summary by status
-        status_counts = {}
-        for task in tasks_data:
-            status = task.get('status', 'unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = Counter(task.get('status', 'unknown') for task in tasks_data)
         
         # Priority distribution
-        priority_counts = {}
-        for task in tasks_data:
-            priority = task.get('priority', 'medium')
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
+        priority_counts = Counter(task.get('priority', 'medium') for task in tasks_data)
         
         summary_text = f"""
         The organization is tracking {len(tasks_data)} ESG-related tasks across all categories. 
@@ -610,11 +605,11 @@ class ESGPDFReportGenerator:
     
     def _get_priority_areas(self, tasks_data: List[Dict[str, Any]]) -> str:
         """Identify priority areas from tasks."""
-        high_priority_categories = {}
-        for task in tasks_data:
-            if task.get('priority') == 'high' and task.get('status') != 'completed':
-                cat = task.get('category', 'other')
-                high_priority_categories[cat] = high_priority_categories.get(cat, 0) + 1
+        high_priority_categories = Counter(
+            task.get('category', 'other')
+            for task in tasks_data
+            if task.get('priority') == 'high' and task.get('status') != 'completed'
+        )
         
         if not high_priority_categories:
             return "continuous improvement across all ESG dimensions"
@@ -761,4 +756,16 @@ class ESGPDFReportGenerator:
         
         drawing.add(pie)
         
-        return drawing
\ No newline at end of file
+        return drawing
+
+
+@lru_cache(maxsize=1)
+def get_pdf_report_generator() -> ESGPDFReportGenerator:
+    """
+    Return the process-wide ESGPDFReportGenerator.
+    
+    Building the ReportLab stylesheet is the expensive part of construction;
+    generate_report keeps all per-report state local, so one instance
+    serves every request.
+    """
+    return ESGPDFReportGenerator()
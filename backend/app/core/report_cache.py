@@ -0,0 +1,61 @@
+"""
+In-process cache for generated reports and analytics.
+
+Entries are keyed on a company's data version counter, which every write to
+the company, its tasks or their evidence increments, so any write that
+affects a report produces a new key; superseded entries are never served and
+age out of the LRU.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_MAX_ENTRIES = 128
+
+
+class ReportCache:
+    """Bounded LRU of report payloads with hit/miss counters."""
+
+    def __init__(self, max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        """Initialize an empty cache holding at most max_entries payloads."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached payload for key, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"Report cache hit for {key[0]} ({self.hits} hits, {self.misses} misses)")
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a payload, evicting the least recently used beyond the bound."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+@lru_cache(maxsize=1)
+def get_report_cache() -> ReportCache:
+    """Return the process-wide report cache."""
+    return ReportCache()
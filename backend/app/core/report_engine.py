@@ -3,6 +3,7 @@ ESG Report Generation Engine with template system and export capabilities.
 """
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, date
+from functools import lru_cache
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
@@ -11,7 +12,7 @@ from jinja2 import Environment, FileSystemLoader, Template
 import logging
 
 from .esg_calculator import (
-    ESGCalculator, ESGScores, CarbonFootprint, 
+    ESGScores, CarbonFootprint, get_esg_calculator, 
     ComplianceRate, BenchmarkComparison, BusinessSector
 )
 from .data_validator import ESGDataValidator, ValidationResult
@@ -36,6 +37,10 @@ class OutputFormat(str, Enum):
     JSON = "json"
 
 
+class ReportGenerationError(Exception):
+    """A report could not be generated; the message is logged, not returned."""
+
+
 @dataclass
 class ReportMetadata:
     """Report metadata and configuration."""
@@ -203,7 +208,7 @@ class ReportGenerator:
     """Main report generation engine."""
     
     def __init__(self):
-        self.calculator = ESGCalculator()
+        self.calculator = get_esg_calculator()
         self.template_manager = ReportTemplateManager()
         self.recommendations_engine = RecommendationEngine()
         self.validator = ESGDataValidator()
@@ -534,4 +539,15 @@ class RecommendationEngine:
             ]
         }
         
-        return sector_advice.get(sector, [])
\ No newline at end of file
+        return sector_advice.get(sector, [])
+
+
+@lru_cache(maxsize=1)
+def get_report_generator() -> ReportGenerator:
+    """
+    Return the process-wide ReportGenerator.
+    
+    It holds a Jinja environment and stateless helpers only, so it is
+    built once instead of on every report request.
+    """
+    return ReportGenerator()
@@ -18,7 +18,8 @@ from ..models.company import Company, BusinessSector
 from ..models.tasks import Task, Evidence, TaskStatus, TaskCategory
 from ..auth.models import User
 from ..config import settings
-from .markdown_parser import ESGContentParser
+from .audit_queue import get_audit_queue
+from .markdown_parser import get_content_parser
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +44,8 @@ class ESGReportGenerator:
         self.jinja_env.filters['get_status_color'] = self._get_status_color
         self.jinja_env.filters['get_category_icon'] = self._get_category_icon
         
-        # Initialize ESG content parser
-        self.esg_parser = ESGContentParser()
+        # Share the process-wide ESG content parser
+        self.esg_parser = get_content_parser()
     
     def _format_date(self, value: datetime | date | None) -> str:
         """Format date for display in reports."""
@@ -106,7 +107,7 @@ class ESGReportGenerator:
             
             # Create audit log entry
             if current_user:
-                await self._create_audit_log(db, current_user.id, company_id, "report_generated")
+                self._create_audit_log(current_user.id, company_id, "report_generated")
             
             # Generate HTML from template
             html_content = await self._render_html_template(report_data, include_evidence_links)
@@ -831,11 +832,9 @@ class ESGReportGenerator:
         }
         '''
     
-    async def _create_audit_log(self, db: AsyncSession, user_id: str, company_id: str, action: str):
-        """Create audit log entry for report generation."""
-        from ..models.audit import AuditLog
-        
-        audit_log = AuditLog(
+    def _create_audit_log(self, user_id: str, company_id: str, action: str):
+        """Queue audit log entry for report generation."""
+        get_audit_queue().enqueue(
             user_id=user_id,
             action=action,
             resource_type="company",
@@ -844,9 +843,5 @@ class ESGReportGenerator:
                 "report_type": "esg_assessment",
                 "generated_at": datetime.utcnow().isoformat()
             },
-            timestamp=datetime.utcnow(),
             ip_address="system"
-        )
-        
-        db.add(audit_log)
-        await db.commit()
\ No newline at end of file
+        )
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Server-Timing instrumentation.
+
+The timing middleware opens a span list for each request; code anywhere in
+the request wraps a stage in timed(name), and the middleware emits the spans
+plus the total as a Server-Timing header, so browser devtools show where a
+request spent its time. Outside a request timed() records nothing.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+Span = Tuple[str, float]
+
+_spans: ContextVar[Optional[List[Span]]] = ContextVar("server_timing_spans", default=None)
+
+
+@contextmanager
+def collect_server_timing() -> Iterator[List[Span]]:
+    """Collect the spans recorded while the block runs."""
+    spans: List[Span] = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record how long the block takes as a Server-Timing span."""
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, (perf_counter() - start) * 1000))
+
+
+def format_server_timing(spans: List[Span], total_ms: float) -> str:
+    """Build a Server-Timing header value; durations are in milliseconds."""
+    metrics = [f"{name};dur={duration:.1f}" for name, duration in spans]
+    metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
@@ -7,9 +7,10 @@ from datetime import datetime, date, timedelta
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
-from .markdown_parser import ESGContentParser, ESGQuestion
+from .data_version import NEXT_DATA_VERSION, bump_data_version
+from .markdown_parser import ESGContentParser, ESGQuestion, get_content_parser
 from ..models import Company, Task, TaskStatus, TaskCategory
 from ..models.company import BusinessSector
 
@@ -21,7 +22,8 @@ class TaskGenerator:
     
     def __init__(self, parser: Optional[ESGContentParser] = None):
         """Initialize task generator with ESG content parser."""
-        self.parser = parser or ESGContentParser()
+        # The shared parser keeps parsed sector content across requests
+        self.parser = parser or get_content_parser()
     
     async def generate_tasks_for_company(
         self,
@@ -49,10 +51,16 @@ class TaskGenerator:
         try:
             # Get company information
             print(f"📋 Step 1: Fetching company data for ID: {company_id}")
+            # Only the fields used below; no ORM instance is built
             result = await db.execute(
-                select(Company).where(Company.id == company_id)
+                select(
+                    Company.name,
+                    Company.business_sector,
+                    Company.main_location,
+                    Company.description
+                ).where(Company.id == company_id)
             )
-            company = result.scalar_one_or_none()
+            company = result.one_or_none()
             
             if not company:
                 print(f"❌ ERROR: Company not found with ID: {company_id}")
@@ -105,10 +113,8 @@ class TaskGenerator:
                 cat = task.category.value if hasattr(task.category, 'value') else str(task.category)
                 categories[cat] = categories.get(cat, 0) + 1
                 
-                if hasattr(task, 'framework_tags') and task.framework_tags:
-                    fw_list = eval(task.framework_tags) if isinstance(task.framework_tags, str) else task.framework_tags
-                    for fw in fw_list:
-                        frameworks[fw] = frameworks.get(fw, 0) + 1
+                for fw in task.framework_tags or []:
+                    frameworks[fw] = frameworks.get(fw, 0) + 1
             
             print(f"   • Categories: {dict(categories)}")
             print(f"   • Frameworks: {dict(frameworks)}")
@@ -182,6 +188,7 @@ class TaskGenerator:
         
         print(f"\n💾 Saving {len(tasks)} tasks to database...")
         try:
+            await bump_data_version(db, company_id)
             await db.commit()
             print(f"   ✅ Successfully saved {len(tasks)} tasks to database")
             logger.info(f"Successfully saved {len(tasks)} tasks to database")
@@ -263,21 +270,19 @@ class TaskGenerator:
         try:
             # Delete existing tasks that haven't been started
             await db.execute(
-                select(Task).where(
+                delete(Task).where(
                     Task.company_id == company_id,
                     Task.status == TaskStatus.TODO
-                ).delete()
+                )
             )
             
-            # Update company sector
-            result = await db.execute(
-                select(Company).where(Company.id == company_id)
+            # Update company sector without loading the row
+            await db.execute(
+                update(Company)
+                .where(Company.id == company_id)
+                .values(business_sector=new_sector, data_version=NEXT_DATA_VERSION)
             )
-            company = result.scalar_one_or_none()
-            
-            if company:
-                company.business_sector = new_sector
-                await db.commit()
+            await db.commit()
             
             # Generate new tasks
             new_tasks = await self.generate_tasks_for_company(
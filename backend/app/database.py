@@ -4,21 +4,58 @@ Fixed for SQLite compatibility.
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 from .config import settings
+import asyncio
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+
+def _json_serializer(value) -> str:
+    """Encode JSON column values with orjson; drivers expect str, not bytes."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine with SQLite-specific settings
 engine = create_async_engine(
     settings.database_url_async,
     echo=settings.debug,
     future=True,
     # SQLite specific settings
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url_async else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url_async else {},
+    # Batch bulk ORM inserts into multi-row INSERT ... VALUES statements;
+    # SQLite gets smaller pages to stay under its bound-parameter limit
+    insertmanyvalues_page_size=500 if "sqlite" in settings.database_url_async else 1000,
+    # JSON/JSONB columns (and asyncpg's json codecs) use orjson
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
+# Tune SQLite connections as they are opened
+if "sqlite" in settings.database_url_async:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Tune each new SQLite connection.
+        
+        WAL lets readers run concurrently with a single writer, and
+        synchronous=NORMAL is durable under WAL with half the fsyncs.
+        foreign_keys is needed for ON DELETE CASCADE, which the ORM
+        relationships rely on via passive_deletes.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+        cursor.close()
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -58,6 +95,20 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def execute_concurrently(*statements):
+    """
+    Execute independent read-only statements in parallel.
+    
+    A single AsyncSession cannot run queries concurrently, so each statement
+    gets its own pooled session. Results are buffered and returned in order.
+    """
+    async def _execute(statement):
+        async with AsyncSessionLocal() as session:
+            return await session.execute(statement)
+    
+    return await asyncio.gather(*(_execute(statement) for statement in statements))
+
+
 async def init_db():
     """
     Initialize database tables.
@@ -4,17 +4,23 @@ Main FastAPI application for ESG platform.
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 import time
 import logging
 
 from .config import settings
-from .database import init_db
+from .database import init_db, AsyncSessionLocal
+from .auth.dependencies import get_user_by_id, get_user_site_permissions
 from .auth.router import router as auth_router
 from .routers.companies import router as companies_router
 from .routers.tasks import router as tasks_router
-from .core.markdown_parser import ESGContentParser
+from .core.audit_queue import get_audit_queue
+from .core.markdown_parser import get_content_parser
+from .core.report_engine import ReportGenerationError
+from .core.server_timing import collect_server_timing, format_server_timing
 from .middleware.security import SecurityMiddleware
+from .models.company import BusinessSector
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +33,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    # Encode route responses with orjson rather than the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware FIRST - critical for frontend communication
@@ -51,11 +59,13 @@ if not settings.debug:
 
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses."""
+    """Add processing time and Server-Timing headers to responses."""
     start_time = time.time()
-    response = await call_next(request)
+    with collect_server_timing() as spans:
+        response = await call_next(request)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["Server-Timing"] = format_server_timing(spans, process_time * 1000)
     return response
 
 
@@ -80,8 +90,6 @@ async def rbac_middleware(request: Request, call_next):
         
         if authorization and authorization.startswith("Bearer "):
             try:
-                from .auth.dependencies import get_current_user, get_user_site_permissions
-                from .database import AsyncSessionLocal
                 import jwt
                 
                 token = authorization.split(" ")[1]
@@ -90,7 +98,6 @@ async def rbac_middleware(request: Request, call_next):
                 
                 if user_id:
                     async with AsyncSessionLocal() as db:
-                        from .auth.dependencies import get_user_by_id
                         user = await get_user_by_id(db, user_id)
                         
                         if user:
@@ -120,6 +127,36 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Database error handler; the request's session is rolled back by get_db."""
+    logger.error(f"Database error: {exc}", exc_info=True)
+    
+    return JSONResponse(
+        status_code=400,
+        content={
+            "error": str(exc) if settings.debug else "Database operation failed",
+            "status_code": 400,
+            "path": request.url.path
+        }
+    )
+
+
+@app.exception_handler(ReportGenerationError)
+async def report_generation_exception_handler(request: Request, exc: ReportGenerationError):
+    """Report generation failure handler; details stay in the server log."""
+    logger.error(f"Report generation failed for {request.url.path}: {exc}")
+    
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": str(exc) if settings.debug else "Report generation failed",
+            "status_code": 500,
+            "path": request.url.path
+        }
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """General exception handler for unhandled exceptions."""
@@ -178,8 +215,11 @@ async def startup_event():
         await init_db()
         logger.info("Database initialized successfully")
         
+        # Start the audit log writer
+        get_audit_queue().start()
+        
         # Validate ESG content structure
-        parser = ESGContentParser()
+        parser = get_content_parser()
         if parser.validate_content_structure():
             logger.info("ESG content validation passed")
         else:
@@ -195,6 +235,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown."""
+    # Flush queued audit log entries before the process exits
+    await get_audit_queue().stop()
     logger.info("Application shutdown")
 
 
@@ -227,8 +269,6 @@ async def auth_options():
 @app.get("/api/sectors")
 async def get_supported_sectors():
     """Get list of supported business sectors."""
-    from .models.company import BusinessSector
-    
     return {
         "sectors": [
             {
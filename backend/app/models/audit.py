@@ -1,7 +1,7 @@
 """
 Audit log model for tracking user actions.
 """
-from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, CHAR, String, Text, DateTime, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -11,9 +11,9 @@ class AuditLog(Base):
     """Audit log for tracking all user actions."""
     __tablename__ = "audit_logs"
     
-    # Use String ID instead of UUID for SQLite compatibility
-    id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Fixed-width UUID string ID (portable between SQLite and Postgres)
+    id = Column(CHAR(36), primary_key=True)
+    user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Action details
     action = Column(String, nullable=False)  # e.g., "user_login", "task_create"
@@ -1,11 +1,11 @@
 """
 Company model - Fixed for SQLite compatibility.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy import Column, CHAR, String, Boolean, DateTime, Integer, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 from ..database import Base
+from .types import FastJSON, utcnow
 
 
 class BusinessSector(str, enum.Enum):
@@ -24,9 +24,19 @@ class BusinessSector(str, enum.Enum):
 class Company(Base):
     """Company model with SQLite-compatible string ID."""
     __tablename__ = "companies"
+    __table_args__ = (
+        Index(
+            "ix_companies_scoping_data_gin",
+            "scoping_data",
+            postgresql_using="gin",
+            postgresql_ops={"scoping_data": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {"eager_defaults": True}
     
-    # Use String ID instead of UUID for SQLite compatibility
-    id = Column(String, primary_key=True)
+    # Fixed-width UUID string ID (portable between SQLite and Postgres)
+    id = Column(CHAR(36), primary_key=True)
     name = Column(String, nullable=False)
     main_location = Column(String, default="UAE")
     business_sector = Column(SQLEnum(BusinessSector), nullable=True)
@@ -38,18 +48,22 @@ class Company(Base):
     # ESG Scoping
     esg_scoping_completed = Column(Boolean, default=False)
     scoping_completed_at = Column(DateTime, nullable=True)
-    scoping_data = Column(JSON, nullable=True)  # Store full scoping results
+    scoping_data = Column(FastJSON, nullable=True)  # Store full scoping results
+    
+    # Incremented with every write to the company, its tasks or their
+    # evidence; validators key on it rather than on timestamps
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    users = relationship("User", back_populates="company", cascade="all, delete-orphan")
-    tasks = relationship("Task", back_populates="company", cascade="all, delete-orphan")
-    esg_scoping_responses = relationship("ESGScopingResponse", back_populates="company", cascade="all, delete-orphan")
-    framework_registrations = relationship("FrameworkRegistration", back_populates="company", cascade="all, delete-orphan")
-    utility_meters = relationship("UtilityMeter", back_populates="company", cascade="all, delete-orphan")
+    users = relationship("User", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    tasks = relationship("Task", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    esg_scoping_responses = relationship("ESGScopingResponse", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    framework_registrations = relationship("FrameworkRegistration", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    utility_meters = relationship("UtilityMeter", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Company(id={self.id}, name={self.name})>"
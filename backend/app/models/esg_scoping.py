@@ -1,27 +1,38 @@
 """
 ESG Scoping models for storing assessment data.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Integer, Boolean, Float, Date
+from sqlalchemy import Column, CHAR, String, DateTime, ForeignKey, Integer, Boolean, Float, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 
 from ..database import Base
+from .types import FastJSON
 
 
 class ESGScopingResponse(Base):
     """Store ESG scoping wizard responses and assessment data."""
     
     __tablename__ = "esg_scoping_responses"
-    
-    id = Column(String, primary_key=True)
-    company_id = Column(String, ForeignKey('companies.id'), nullable=False)
+    __table_args__ = (
+        # Reports and scoping status look responses up by company
+        Index("ix_esg_scoping_responses_company_id", "company_id"),
+        Index(
+            "ix_esg_answers_gin",
+            "answers",
+            postgresql_using="gin",
+            postgresql_ops={"answers": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+    
+    id = Column(CHAR(36), primary_key=True)
+    company_id = Column(CHAR(36), ForeignKey('companies.id', ondelete='CASCADE'), nullable=False)
     
     # Scoping data
     sector = Column(String, nullable=False)
-    answers = Column(JSON, nullable=False)  # Question ID -> answer mapping
-    preferences = Column(JSON, nullable=True)  # User preferences
-    location_data = Column(JSON, nullable=True)  # Location-specific data
+    answers = Column(FastJSON, nullable=False)  # Question ID -> answer mapping
+    preferences = Column(FastJSON, nullable=True)  # User preferences
+    location_data = Column(FastJSON, nullable=True)  # Location-specific data
     
     # Completion tracking
     completed_at = Column(DateTime(timezone=True), nullable=False)
@@ -29,7 +40,7 @@ class ESGScopingResponse(Base):
     
     # Assessment metadata
     assessment_score = Column(Float, nullable=True)
-    framework_compliance = Column(JSON, nullable=True)  # Framework -> compliance status
+    framework_compliance = Column(FastJSON, nullable=True)  # Framework -> compliance status
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -44,8 +55,8 @@ class UtilityMeter(Base):
     
     __tablename__ = "utility_meters"
     
-    id = Column(String, primary_key=True)
-    company_id = Column(String, ForeignKey('companies.id'), nullable=False)
+    id = Column(CHAR(36), primary_key=True)
+    company_id = Column(CHAR(36), ForeignKey('companies.id', ondelete='CASCADE'), nullable=False)
     location_name = Column(String, nullable=True)  # Simple location name instead of foreign key
     
     # Meter details
@@ -64,7 +75,7 @@ class UtilityMeter(Base):
     
     # Relationships
     company = relationship("Company", back_populates="utility_meters")
-    consumption_records = relationship("ConsumptionRecord", back_populates="meter")
+    consumption_records = relationship("ConsumptionRecord", back_populates="meter", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class ConsumptionRecord(Base):
@@ -72,8 +83,8 @@ class ConsumptionRecord(Base):
     
     __tablename__ = "consumption_records"
     
-    id = Column(String, primary_key=True)
-    meter_id = Column(String, ForeignKey('utility_meters.id'), nullable=False)
+    id = Column(CHAR(36), primary_key=True)
+    meter_id = Column(CHAR(36), ForeignKey('utility_meters.id', ondelete='CASCADE'), nullable=False)
     
     # Consumption data
     reading_date = Column(Date, nullable=False)
@@ -83,7 +94,7 @@ class ConsumptionRecord(Base):
     bill_reference = Column(String, nullable=True)
     
     # Upload tracking
-    uploaded_by = Column(String, ForeignKey('users.id'), nullable=False)
+    uploaded_by = Column(CHAR(36), ForeignKey('users.id'), nullable=False)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Timestamps
@@ -100,8 +111,8 @@ class FrameworkRegistration(Base):
     
     __tablename__ = "framework_registrations"
     
-    id = Column(String, primary_key=True)
-    company_id = Column(String, ForeignKey('companies.id'), nullable=False)
+    id = Column(CHAR(36), primary_key=True)
+    company_id = Column(CHAR(36), ForeignKey('companies.id', ondelete='CASCADE'), nullable=False)
     
     # Framework details
     framework_name = Column(String, nullable=False)  # DST, Green Key, etc.
@@ -111,7 +122,7 @@ class FrameworkRegistration(Base):
     renewal_date = Column(Date, nullable=True)
     
     # Registration metadata
-    registration_data = Column(JSON, nullable=True)  # Framework-specific data
+    registration_data = Column(FastJSON, nullable=True)  # Framework-specific data
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,19 +1,26 @@
 """
 Evidence model for task documentation.
 """
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, CHAR, String, Text, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from ..database import Base
+from .types import utcnow
 
 
 class Evidence(Base):
     """Evidence model for task compliance documentation."""
     __tablename__ = "evidence"
+    __table_args__ = (
+        # Evidence is always listed (newest first) and counted per task; the
+        # index is read backwards for the descending sort
+        Index("ix_evidence_task_created", "task_id", "created_at"),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {"eager_defaults": True}
     
-    # Use String ID instead of UUID for SQLite compatibility
-    id = Column(String, primary_key=True)
-    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"))
+    # Fixed-width UUID string ID (portable between SQLite and Postgres)
+    id = Column(CHAR(36), primary_key=True)
+    task_id = Column(CHAR(36), ForeignKey("tasks.id", ondelete="CASCADE"))
     
     # File information
     filename = Column(String, nullable=False)
@@ -23,10 +30,10 @@ class Evidence(Base):
     
     # Evidence details
     description = Column(Text)
-    uploaded_by = Column(String, ForeignKey("users.id"))
+    uploaded_by = Column(CHAR(36), ForeignKey("users.id"))
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
     
     # Relationships
     task = relationship("Task", back_populates="evidence")
@@ -1,11 +1,11 @@
 """
 Task model - Fixed for SQLite compatibility.
 """
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, CHAR, String, Text, DateTime, Boolean, Integer, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 from ..database import Base
+from .types import FastJSON, utcnow
 
 
 class TaskStatus(str, enum.Enum):
@@ -44,10 +44,18 @@ class TaskType(str, enum.Enum):
 class Task(Base):
     """Task model with SQLite-compatible string ID."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Company-scoped task counts filter or group by status and category;
+        # the (category, status) breakdowns are answered from the index alone
+        Index("ix_tasks_company_status", "company_id", "status"),
+        Index("ix_tasks_company_category_status", "company_id", "category", "status"),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {"eager_defaults": True}
     
-    # Use String ID instead of UUID for SQLite compatibility
-    id = Column(String, primary_key=True)
-    company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"))
+    # Fixed-width UUID string ID (portable between SQLite and Postgres)
+    id = Column(CHAR(36), primary_key=True)
+    company_id = Column(CHAR(36), ForeignKey("companies.id", ondelete="CASCADE"))
     
     # Task details
     title = Column(String, nullable=False)
@@ -62,7 +70,7 @@ class Task(Base):
     task_type = Column(SQLEnum(TaskType), default=TaskType.COMPLIANCE)
     
     # Framework and requirements
-    framework_tags = Column(String)  # JSON string of framework tags
+    framework_tags = Column(FastJSON, default=list)  # List of framework tags
     regulatory_requirement = Column(String, default="false")  # Store as string for SQLite
     sector = Column(String)
     
@@ -74,13 +82,13 @@ class Task(Base):
     phase_dependency = Column(String, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
     completed_at = Column(DateTime, nullable=True)
     
     # Relationships
     company = relationship("Company", back_populates="tasks")
-    evidence = relationship("Evidence", back_populates="task", cascade="all, delete-orphan")
+    evidence = relationship("Evidence", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
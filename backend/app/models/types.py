@@ -0,0 +1,78 @@
+"""
+Shared column types used across models.
+"""
+import orjson
+from sqlalchemy import JSON, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC timestamp generated by the database.
+    
+    Used for created_at/updated_at server defaults. SQLite's CURRENT_TIMESTAMP
+    (what func.now() compiles to there) only has second resolution, so on
+    SQLite this renders strftime() with fractional seconds instead.
+    """
+    
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "now()"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class FastJSON(TypeDecorator):
+    """
+    JSON column serialized with orjson instead of the stdlib json module.
+    
+    Stored as generic JSON on SQLite and binary JSONB on Postgres, so
+    documents are kept pre-parsed and can be served by GIN indexes. Postgres
+    values go through the engine's JSON serializer and the driver's JSONB
+    codec, which the engine also points at orjson.
+    """
+    
+    impl = JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+    
+    def bind_processor(self, dialect):
+        if dialect.name == "postgresql":
+            return super().bind_processor(dialect)
+        
+        def process(value):
+            if value is None:
+                return None
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        return process
+    
+    def result_processor(self, dialect, coltype):
+        if dialect.name == "postgresql":
+            return super().result_processor(dialect, coltype)
+        
+        def process(value):
+            if value is None:
+                return None
+            return orjson.loads(value)
+        
+        return process
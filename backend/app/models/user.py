@@ -1,11 +1,11 @@
 """
 User model - Fixed for SQLite compatibility.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, CHAR, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 from ..database import Base
+from .types import utcnow
 
 
 class UserRole(str, enum.Enum):
@@ -19,9 +19,11 @@ class UserRole(str, enum.Enum):
 class User(Base):
     """User model with SQLite-compatible string ID."""
     __tablename__ = "users"
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {"eager_defaults": True}
     
-    # Use String ID instead of UUID for SQLite compatibility
-    id = Column(String, primary_key=True)
+    # Fixed-width UUID string ID (portable between SQLite and Postgres)
+    id = Column(CHAR(36), primary_key=True)
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String)
@@ -32,16 +34,18 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     
     # Company association
-    company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"))
+    company_id = Column(CHAR(36), ForeignKey("companies.id", ondelete="CASCADE"))
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
     last_login = Column(DateTime, nullable=True)
     
     # Relationships
     company = relationship("Company", back_populates="users")
-    audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan")
+    # Audit rows outlive their user; the foreign key's ON DELETE SET NULL
+    # applies whether or not the collection is loaded
+    audit_logs = relationship("AuditLog", back_populates="user", cascade="save-update, merge", passive_deletes=True)
     consumption_uploads = relationship("ConsumptionRecord", back_populates="uploader")
     
     def __repr__(self):
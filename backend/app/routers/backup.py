@@ -1,24 +1,68 @@
 """
 Backup and disaster recovery API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, List
+from datetime import datetime
+from uuid import uuid4
 import logging
+import orjson
 
 from ..auth.dependencies import get_admin_user
-from ..core.backup import BackupManager, DisasterRecoveryManager, backup_health_check
+from ..core.backup import (
+    BackupManager,
+    DisasterRecoveryManager,
+    backup_health_check,
+    get_backup_manager,
+    get_disaster_recovery_manager
+)
 from ..models import User
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Security feature flags never change at runtime, so serialize them once
+_SECURITY_FEATURES_JSON = orjson.dumps({
+    "rate_limiting": "active",
+    "input_validation": "active",
+    "file_upload_security": "active",
+    "audit_logging": "active",
+    "rbac_enforcement": "active"
+})
+
+# In-process registry of restore jobs, keyed by job ID
+restore_jobs: Dict[str, Dict[str, Any]] = {}
+
+
+async def _run_restore(job_id: str, backup_path: str, restore_files: bool):
+    """Run a backup restoration and record its outcome in restore_jobs."""
+    job = restore_jobs[job_id]
+    job["status"] = "in_progress"
+    
+    try:
+        backup_manager = get_backup_manager()
+        job["result"] = await backup_manager.restore_from_backup(
+            backup_path=backup_path,
+            restore_files=restore_files
+        )
+        job["status"] = "completed"
+        
+    except Exception as e:
+        logger.error(f"Backup restoration job {job_id} failed: {e}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    
+    finally:
+        job["finished_at"] = datetime.utcnow().isoformat()
+
 
 @router.post("/backup/create")
 async def create_backup(
     background_tasks: BackgroundTasks,
     include_files: bool = True,
+    backup_manager: BackupManager = Depends(get_backup_manager),
     current_user: User = Depends(get_admin_user)
 ) -> Dict[str, Any]:
     """
@@ -32,11 +76,12 @@ async def create_backup(
         Backup creation result
     """
     try:
-        backup_manager = BackupManager()
-        
-        # Create backup in background
-        backup_task = backup_manager.create_full_backup(include_files=include_files)
-        background_tasks.add_task(backup_task)
+        # Create backup in background; pass the coroutine function itself so
+        # Starlette awaits it after the response is sent
+        background_tasks.add_task(
+            backup_manager.create_full_backup,
+            include_files=include_files
+        )
         
         return {
             "message": "Backup creation started",
@@ -54,6 +99,7 @@ async def create_backup(
 
 @router.get("/backup/list")
 async def list_backups(
+    backup_manager: BackupManager = Depends(get_backup_manager),
     current_user: User = Depends(get_admin_user)
 ) -> List[Dict[str, Any]]:
     """
@@ -63,7 +109,6 @@ async def list_backups(
         List of backup metadata
     """
     try:
-        backup_manager = BackupManager()
         backups = await backup_manager.list_backups()
         return backups
         
@@ -77,6 +122,7 @@ async def list_backups(
 
 @router.post("/backup/restore")
 async def restore_backup(
+    background_tasks: BackgroundTasks,
     backup_path: str,
     restore_files: bool = True,
     current_user: User = Depends(get_admin_user)
@@ -84,32 +130,54 @@ async def restore_backup(
     """
     Restore system from backup (admin only).
     
+    The restoration runs in the background; poll
+    /backup/restore/{job_id}/status for its progress.
+    
     Args:
         backup_path: Path to backup file
         restore_files: Whether to restore uploaded files
         current_user: Current authenticated admin user
         
     Returns:
-        Restoration result
+        Restoration job information
     """
-    try:
-        backup_manager = BackupManager()
-        result = await backup_manager.restore_from_backup(
-            backup_path=backup_path,
-            restore_files=restore_files
-        )
-        
-        return {
-            "message": "Backup restored successfully",
-            "result": result
-        }
-        
-    except Exception as e:
-        logger.error(f"Backup restoration failed: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to restore backup: {str(e)}"
-        )
+    job_id = uuid4().hex
+    restore_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "pending",
+        "backup_path": backup_path,
+        "restore_files": restore_files,
+        "started_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+        "result": None,
+        "error": None
+    }
+    
+    background_tasks.add_task(_run_restore, job_id, backup_path, restore_files)
+    
+    return {
+        "message": "Backup restoration started",
+        "job_id": job_id,
+        "status": "pending"
+    }
+
+
+@router.get("/backup/restore/{job_id}/status")
+async def get_restore_status(
+    job_id: str,
+    current_user: User = Depends(get_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get the status of a backup restoration job (admin only).
+    
+    Returns:
+        Restoration job status and result
+    """
+    job = restore_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Restore job not found")
+    
+    return job
 
 
 @router.get("/backup/health")
@@ -136,6 +204,7 @@ async def get_backup_health(
 
 @router.get("/disaster-recovery/plan")
 async def get_disaster_recovery_plan(
+    dr_manager: DisasterRecoveryManager = Depends(get_disaster_recovery_manager),
     current_user: User = Depends(get_admin_user)
 ) -> Dict[str, Any]:
     """
@@ -145,7 +214,6 @@ async def get_disaster_recovery_plan(
         Disaster recovery plan document
     """
     try:
-        dr_manager = DisasterRecoveryManager()
         plan = await dr_manager.create_disaster_recovery_plan()
         return plan
         
@@ -159,6 +227,7 @@ async def get_disaster_recovery_plan(
 
 @router.post("/disaster-recovery/test")
 async def test_disaster_recovery(
+    dr_manager: DisasterRecoveryManager = Depends(get_disaster_recovery_manager),
     current_user: User = Depends(get_admin_user)
 ) -> Dict[str, Any]:
     """
@@ -168,7 +237,6 @@ async def test_disaster_recovery(
         Test results
     """
     try:
-        dr_manager = DisasterRecoveryManager()
         test_results = await dr_manager.test_disaster_recovery()
         return test_results
         
@@ -183,7 +251,7 @@ async def test_disaster_recovery(
 @router.get("/system/security-status")
 async def get_security_status(
     current_user: User = Depends(get_admin_user)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get overall system security status (admin only).
     
@@ -194,26 +262,23 @@ async def get_security_status(
         # Get backup health
         backup_health = await backup_health_check()
         
-        # Get basic security metrics
-        security_status = {
-            "overall_status": "healthy",
-            "backup_system": backup_health,
-            "security_features": {
-                "rate_limiting": "active",
-                "input_validation": "active",
-                "file_upload_security": "active",
-                "audit_logging": "active",
-                "rbac_enforcement": "active"
-            },
-            "recommendations": []
-        }
+        overall_status = "healthy"
+        recommendations = []
         
         # Add recommendations based on backup health
         if not backup_health.get("backup_system_healthy", False):
-            security_status["overall_status"] = "warning"
-            security_status["recommendations"].extend(backup_health.get("issues", []))
+            overall_status = "warning"
+            recommendations.extend(backup_health.get("issues", []))
         
-        return security_status
+        # Only the dynamic sections are serialized per request
+        content = (
+            b'{"overall_status":' + orjson.dumps(overall_status)
+            + b',"backup_system":' + orjson.dumps(backup_health)
+            + b',"security_features":' + _SECURITY_FEATURES_JSON
+            + b',"recommendations":' + orjson.dumps(recommendations)
+            + b'}'
+        )
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to get security status: {e}")
@@ -2,9 +2,12 @@
 Fixed routers/companies.py to match the actual Company model
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, cast, bindparam, lambda_stmt, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+import orjson
 
 from ..database import get_db
 from ..schemas.company import (
@@ -13,6 +16,8 @@ from ..schemas.company import (
     CompanyProfile
 )
 from ..models import Company, User, Task, TaskStatus
+from ..core.data_version import NEXT_DATA_VERSION
+from ..core.etag import make_etag, etag_matches, set_etag, not_modified
 from ..auth.dependencies import (
     get_current_user, 
     require_admin, 
@@ -22,78 +27,109 @@ from ..auth.dependencies import (
 
 router = APIRouter()
 
+# Company columns needed to build a CompanyProfile
+PROFILE_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.main_location,
+    Company.business_sector,
+    Company.esg_scoping_completed,
+    Company.scoping_completed_at,
+    Company.created_at,
+    Company.updated_at,
+    Company.scoping_data,
+)
+
+# Company lookup by primary key; the lambda gives the statement a stable
+# cache key so it is not rebuilt and re-walked on every request
+GET_COMPANY = lambda_stmt(
+    lambda: select(Company).where(Company.id == bindparam("cid"))
+)
+
+
+def _set_location_data(dialect_name: str, locations: List[dict]):
+    """Build a scoping_data expression replacing only its location_data key."""
+    if dialect_name == "postgresql":
+        return func.jsonb_set(
+            func.coalesce(Company.scoping_data, func.jsonb_build_object()),
+            cast(["location_data"], ARRAY(Text)),
+            cast(locations, JSONB)
+        )
+    return func.json_set(
+        func.coalesce(Company.scoping_data, func.json_object()),
+        "$.location_data",
+        func.json(orjson.dumps(locations).decode())
+    )
+
 
 @router.get("/me", response_model=CompanyProfile)
 @router.get("/current", response_model=CompanyProfile)  # Alternative endpoint
 async def get_my_company(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's company with statistics."""
-    try:
-        # Get company with related data
-        result = await db.execute(
-            select(Company)
-            .where(Company.id == current_user.company_id)
-        )
-        company = result.scalar_one_or_none()
-        
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
-        
-        # Get statistics
-        users_count = await db.execute(
-            select(func.count(User.id))
-            .where(User.company_id == company.id)
-        )
-        total_users = users_count.scalar() or 0
-        
-        # Get task statistics
-        tasks_count = await db.execute(
-            select(func.count(Task.id))
-            .where(Task.company_id == company.id)
+    # Fetch the company and its user/task counts in a single round-trip
+    company_id = current_user.company_id
+    total_users_sq = (
+        select(func.count(User.id))
+        .where(User.company_id == company_id)
+        .scalar_subquery()
+    )
+    total_tasks_sq = (
+        select(func.count(Task.id))
+        .where(Task.company_id == company_id)
+        .scalar_subquery()
+    )
+    completed_tasks_sq = (
+        select(func.count(Task.id))
+        .where(
+            Task.company_id == company_id,
+            Task.status == TaskStatus.COMPLETED
         )
-        total_tasks = tasks_count.scalar() or 0
-        
-        completed_tasks_count = await db.execute(
-            select(func.count(Task.id))
-            .where(
-                Task.company_id == company.id,
-                Task.status == TaskStatus.COMPLETED
-            )
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            *PROFILE_COLUMNS,
+            Company.data_version,
+            total_users_sq.label("total_users"),
+            total_tasks_sq.label("total_tasks"),
+            completed_tasks_sq.label("completed_tasks")
         )
-        completed_tasks = completed_tasks_count.scalar() or 0
-        
-        # Calculate completion percentage
-        completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # Get location data from scoping_data if available
-        locations = []
-        if company.scoping_data and 'location_data' in company.scoping_data:
-            locations = company.scoping_data['location_data']
-        
-        return CompanyProfile(
-            id=company.id,
-            name=company.name,
-            main_location=company.main_location,
-            business_sector=company.business_sector,
-            esg_scoping_completed=company.esg_scoping_completed,
-            scoping_completed_at=company.scoping_completed_at,
-            created_at=company.created_at,
-            updated_at=company.updated_at,
-            total_users=total_users,
-            total_locations=len(locations),
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
-            completion_percentage=completion_percentage,
-            locations=locations,
-            scoping_data=company.scoping_data
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        .where(Company.id == company_id)
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    total_tasks = row.total_tasks
+    completed_tasks = row.completed_tasks
+    
+    # The profile only changes with the company's data or its user count
+    etag = make_etag(row.id, row.data_version, row.total_users)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # Calculate completion percentage
+    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+    
+    # Get location data from scoping_data if available
+    locations = []
+    if row.scoping_data and 'location_data' in row.scoping_data:
+        locations = row.scoping_data['location_data']
+    
+    # Values come straight from typed columns, so skip re-validation
+    return CompanyProfile.model_construct(
+        **row._mapping,
+        total_locations=len(locations),
+        completion_percentage=completion_percentage,
+        locations=locations
+    )
 
 
 @router.put("/me", response_model=CompanyResponse)
@@ -104,50 +140,37 @@ async def update_my_company(
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user's company (Admin only)."""
-    try:
+    update_data = company_update.dict(exclude_unset=True)
+    
+    if update_data:
+        # Write the changes and read back the updated row, including the
+        # server-set updated_at, in a single UPDATE ... RETURNING
         result = await db.execute(
-            select(Company).where(Company.id == current_user.company_id)
-        )
-        company = result.scalar_one_or_none()
-        
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
-        
-        # Update fields
-        update_data = company_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(company, field, value)
-        
-        await db.commit()
-        await db.refresh(company)
-        
-        # Create audit log
-        await create_audit_log(
-            db=db,
-            user_id=current_user.id,
-            action="company_update",
-            resource_type="company",
-            resource_id=str(company.id),
-            details=update_data,
-            ip_address=request.client.host if request.client else None
-        )
-        
-        return CompanyResponse(
-            id=company.id,
-            name=company.name,
-            main_location=company.main_location,
-            business_sector=company.business_sector,
-            esg_scoping_completed=company.esg_scoping_completed,
-            scoping_completed_at=company.scoping_completed_at,
-            created_at=company.created_at,
-            updated_at=company.updated_at
+            update(Company)
+            .where(Company.id == current_user.company_id)
+            .values(**update_data, data_version=NEXT_DATA_VERSION)
+            .returning(Company)
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Update failed: {str(e)}")
+    else:
+        result = await db.execute(GET_COMPANY, {"cid": current_user.company_id})
+    company = result.scalar_one_or_none()
+    
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    await db.commit()
+    
+    # Create audit log
+    create_audit_log(
+        user_id=current_user.id,
+        action="company_update",
+        resource_type="company",
+        resource_id=str(company.id),
+        details=update_data,
+        ip_address=request.client.host if request.client else None
+    )
+    
+    return CompanyResponse.model_validate(company)
 
 
 @router.post("/{company_id}/locations")
@@ -161,43 +184,34 @@ async def save_locations(
     if current_user.company_id != company_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    try:
-        # Get company
-        result = await db.execute(
-            select(Company).where(Company.id == company_id)
+    # Rewrite the location_data key in place instead of reading the whole
+    # scoping_data document back and writing it out again
+    result = await db.execute(
+        update(Company)
+        .where(Company.id == company_id)
+        .values(
+            scoping_data=_set_location_data(db.get_bind().dialect.name, locations),
+            data_version=NEXT_DATA_VERSION
         )
-        company = result.scalar_one_or_none()
-        
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
-        
-        # Update scoping_data with locations
-        if not company.scoping_data:
-            company.scoping_data = {}
-        
-        company.scoping_data['location_data'] = locations
-        
-        # Mark the column as modified to ensure SQLAlchemy saves it
-        from sqlalchemy.orm.attributes import flag_modified
-        flag_modified(company, "scoping_data")
-        
-        await db.commit()
-        
-        return {
-            "message": "Locations saved successfully",
-            "locations_count": len(locations),
-            "company_id": company_id,
-            "locations": locations
-        }
-        
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to save locations: {str(e)}")
+    )
+    
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    await db.commit()
+    
+    return {
+        "message": "Locations saved successfully",
+        "locations_count": len(locations),
+        "company_id": company_id,
+        "locations": locations
+    }
 
 
-@router.get("/{company_id}/locations")
+@router.get("/{company_id}/locations", response_class=ORJSONResponse)
 async def get_locations(
     company_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -205,24 +219,26 @@ async def get_locations(
     if current_user.company_id != company_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    try:
-        # Get company
-        result = await db.execute(
-            select(Company).where(Company.id == company_id)
+    # Fetch only the location_data subtree of scoping_data
+    result = await db.execute(
+        select(
+            Company.data_version,
+            Company.scoping_data["location_data"].label("locations")
         )
-        company = result.scalar_one_or_none()
-        
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
-        
-        # Get locations from scoping_data
-        locations = []
-        if company.scoping_data and 'location_data' in company.scoping_data:
-            locations = company.scoping_data['location_data']
-        
-        return {
-            "locations": locations
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get locations: {str(e)}")
\ No newline at end of file
+        .where(Company.id == company_id)
+    )
+    company = result.one_or_none()
+    
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    # Locations are saved through the company row, bumping its data version
+    etag = make_etag(company_id, company.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Locations are plain JSON from the database; hand them straight to
+    # orjson instead of walking them with jsonable_encoder
+    response = ORJSONResponse({"locations": company.locations or []})
+    set_etag(response, etag)
+    return response
@@ -1,27 +1,56 @@
 """
 ESG scoping wizard router for dynamic question generation.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, update, func
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import date, datetime, time
 from uuid import uuid4
 
-from ..database import get_db
+from ..database import get_db, execute_concurrently
 from ..auth.dependencies import get_current_user
 from ..models import User, Company, Task, TaskStatus, TaskCategory, TaskPriority, TaskType
-from ..core.markdown_parser import ESGContentParser
+from ..core.audit_queue import get_audit_queue
+from ..core.data_version import NEXT_DATA_VERSION
+from ..core.markdown_parser import get_content_parser
 from ..core.task_generator import TaskGenerator
 from ..schemas.tasks import TaskCreate, TaskResponse
 from ..config import settings
+from ..core.etag import (
+    make_etag,
+    etag_matches,
+    set_etag,
+    not_modified,
+    PUBLIC_CACHE_CONTROL
+)
 
 router = APIRouter()
 
+# Generated task fields arrive as enum values; map them back to members
+CATEGORY_MAP = {category.value: category for category in TaskCategory}
+PRIORITY_MAP = {priority.value: priority for priority in TaskPriority}
+TASK_TYPE_MAP = {task_type.value: task_type for task_type in TaskType}
+
+
+def _due_datetime(due_date: Optional[date]) -> Optional[datetime]:
+    """Widen a generated due date to the midnight datetime the column stores."""
+    if due_date is None or isinstance(due_date, datetime):
+        return due_date
+    return datetime.combine(due_date, time())
+
 @router.get("/esg/sectors")
-async def get_available_sectors():
+async def get_available_sectors(request: Request, response: Response):
     """Get list of available business sectors for ESG scoping."""
-    parser = ESGContentParser()
+    parser = get_content_parser()
+    
+    # Sectors only change when the bundled content file does
+    etag = make_etag("sectors", parser.content_version)
+    if etag_matches(request, etag):
+        return not_modified(etag, PUBLIC_CACHE_CONTROL)
+    set_etag(response, etag, PUBLIC_CACHE_CONTROL)
+    
     sectors = parser.get_available_sectors()
     
     return {
@@ -45,39 +74,17 @@ async def get_sector_questions(
     
     Returns structured questions parsed from markdown content.
     """
-    try:
-        parser = ESGContentParser()
-        questions = parser.parse_sector_questions(sector)
-        
-        if not questions:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"No questions found for sector: {sector}"
-            )
-        
-        # Group questions by category for better UX
-        grouped_questions = {}
-        for question in questions:
-            category = question.get("category", "General")
-            if category not in grouped_questions:
-                grouped_questions[category] = []
-            grouped_questions[category].append(question)
-        
-        return {
-            "sector": sector,
-            "total_questions": len(questions),
-            "categories": list(grouped_questions.keys()),
-            "questions_by_category": grouped_questions,
-            "frameworks": parser.get_sector_frameworks(sector)
-        }
-        
-    except Exception as e:
+    payload = get_content_parser().get_sector_payload(sector)
+    
+    if not payload["total_questions"]:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to parse sector questions: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No questions found for sector: {sector}"
         )
+    
+    return payload
 
-@router.post("/esg/scoping/{company_id}/complete")
+@router.post("/esg/scoping/{company_id}/complete", response_class=ORJSONResponse)
 async def complete_esg_scoping(
     company_id: str,
     scoping_data: Dict[str, Any],
@@ -89,179 +96,164 @@ async def complete_esg_scoping(
     
     Accepts user answers and generates personalized task list.
     """
-    # Verify user has access to company
-    query = select(Company).where(
-        and_(
-            Company.id == company_id,
-            Company.id == current_user.company_id  # Site-scoped access
-        )
-    )
-    result = await db.execute(query)
-    company = result.scalar_one_or_none()
-    
-    if not company:
+    # Verify user has access to company (site-scoped access)
+    if company_id != current_user.company_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company not found or access denied"
         )
     
-    try:
-        # Extract sector and answers from scoping data
-        sector = scoping_data.get("sector")
-        answers = scoping_data.get("answers", {})
-        preferences = scoping_data.get("preferences", {})
-        location_data = scoping_data.get("location_data", [])
-        
-        if not sector:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Sector is required"
-            )
-        
-        # Generate tasks based on scoping results
-        task_generator = TaskGenerator()
-        generated_tasks = task_generator.generate_tasks_from_scoping(
-            sector=sector,
-            answers=answers,
-            preferences=preferences,
-            company_id=company_id,
-            location_data=location_data
+    # Extract sector and answers from scoping data
+    sector = scoping_data.get("sector")
+    answers = scoping_data.get("answers", {})
+    preferences = scoping_data.get("preferences", {})
+    location_data = scoping_data.get("location_data", [])
+    
+    if not sector:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sector is required"
         )
-        
-        # Create tasks in database
-        created_tasks = []
-        for task_data in generated_tasks:
-            # Map category string to enum
-            category_map = {
-                'environmental': TaskCategory.ENVIRONMENTAL,
-                'social': TaskCategory.SOCIAL,
-                'governance': TaskCategory.GOVERNANCE,
-                'energy': TaskCategory.ENERGY,
-                'water': TaskCategory.WATER,
-                'waste': TaskCategory.WASTE,
-                'supply_chain': TaskCategory.SUPPLY_CHAIN
-            }
-            
-            # Map priority string to enum
-            priority_map = {
-                'high': TaskPriority.HIGH,
-                'medium': TaskPriority.MEDIUM,
-                'low': TaskPriority.LOW
-            }
-            
-            # Map task type string to enum
-            task_type_map = {
-                'compliance': TaskType.COMPLIANCE,
-                'monitoring': TaskType.MONITORING,
-                'improvement': TaskType.IMPROVEMENT
-            }
-            
-            task = Task(
-                id=str(uuid4()),
-                company_id=company_id,
-                title=task_data["title"],
-                description=task_data["description"],
-                compliance_context=task_data.get("compliance_context", ""),
-                action_required=task_data.get("action_required", ""),
-                status=TaskStatus.TODO,
-                category=category_map.get(task_data["category"], TaskCategory.ENVIRONMENTAL),
-                framework_tags=str(task_data.get("framework_tags", [])),
-                due_date=task_data.get("due_date"),
-                priority=priority_map.get(task_data.get("priority", "medium").lower(), TaskPriority.MEDIUM),
-                task_type=task_type_map.get(task_data.get("task_type", "compliance"), TaskType.COMPLIANCE),
-                required_evidence_count=task_data.get("required_evidence_count", 1),
-                estimated_hours=task_data.get("estimated_hours", 8),
-                regulatory_requirement=str(task_data.get("regulatory_requirement", False)).lower(),
-                sector=task_data.get("sector", sector),
-                recurring_frequency=task_data.get("recurring_frequency"),
-                phase_dependency=task_data.get("phase_dependency")
-            )
-            
-            db.add(task)
-            created_tasks.append(task)
-        
-        await db.commit()
-        
-        # Refresh tasks to get IDs
-        for task in created_tasks:
-            await db.refresh(task)
-        
-        # Update company's ESG scoping status
-        company.esg_scoping_completed = True
-        company.business_sector = sector
-        company.scoping_completed_at = datetime.utcnow()
-        company.scoping_data = scoping_data  # Store the full scoping results
-        
-        await db.commit()
-        
-        # Create audit log
-        from ..models.audit import AuditLog
-        audit_log = AuditLog(
-            id=str(uuid4()),
-            user_id=current_user.id,
-            action="esg_scoping_completed",
-            resource_type="company",
-            resource_id=str(company_id),
-            details={
-                "sector": sector,
-                "tasks_generated": len(created_tasks),
-                "answers_count": len(answers)
-            },
-            timestamp=datetime.utcnow(),
-            ip_address="unknown"  # TODO: Extract from request
+    
+    # Generate tasks based on scoping results
+    task_generator = TaskGenerator()
+    generated_tasks = task_generator.generate_tasks_from_scoping(
+        sector=sector,
+        answers=answers,
+        preferences=preferences,
+        company_id=company_id,
+        location_data=location_data
+    )
+    
+    # Update company's ESG scoping status without loading the row first
+    result = await db.execute(
+        update(Company)
+        .where(Company.id == company_id)
+        .values(
+            esg_scoping_completed=True,
+            business_sector=sector,
+            scoping_completed_at=datetime.utcnow(),
+            scoping_data=scoping_data,  # Store the full scoping results
+            data_version=NEXT_DATA_VERSION
         )
-        db.add(audit_log)
-        await db.commit()
-        
-        return {
-            "message": "ESG scoping completed successfully",
-            "tasks_generated": len(created_tasks),
-            "sector": sector,
-            "company_id": str(company_id),
-            "tasks": [
-                {
-                    "id": str(task.id),
-                    "title": task.title,
-                    "category": task.category.value,
-                    "priority": task.priority.value,
-                    "task_type": task.task_type.value,
-                    "due_date": task.due_date.isoformat() if task.due_date else None,
-                    "estimated_hours": task.estimated_hours,
-                    "regulatory_requirement": task.regulatory_requirement == "true",
-                    "sector": task.sector,
-                    "recurring_frequency": task.recurring_frequency,
-                    "phase_dependency": task.phase_dependency,
-                    "framework_tags": eval(task.framework_tags) if task.framework_tags else [],
-                    "compliance_context": task.compliance_context,
-                    "action_required": task.action_required
-                }
-                for task in created_tasks
-            ]
-        }
-        
-    except Exception as e:
-        await db.rollback()
+    )
+    
+    if result.rowcount == 0:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to complete ESG scoping: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found or access denied"
         )
+    
+    # Build all task rows up front; IDs are generated here, so nothing
+    # needs to be read back after the insert
+    created_tasks = [
+        {
+            "id": str(uuid4()),
+            "company_id": company_id,
+            "title": task_data["title"],
+            "description": task_data["description"],
+            "compliance_context": task_data.get("compliance_context", ""),
+            "action_required": task_data.get("action_required", ""),
+            "status": TaskStatus.TODO,
+            "category": CATEGORY_MAP.get(task_data["category"], TaskCategory.ENVIRONMENTAL),
+            "framework_tags": task_data.get("framework_tags") or [],
+            "due_date": _due_datetime(task_data.get("due_date")),
+            "priority": PRIORITY_MAP.get(task_data.get("priority", "medium").lower(), TaskPriority.MEDIUM),
+            "task_type": TASK_TYPE_MAP.get(task_data.get("task_type", "compliance"), TaskType.COMPLIANCE),
+            "required_evidence_count": task_data.get("required_evidence_count", 1),
+            "estimated_hours": task_data.get("estimated_hours", 8),
+            "regulatory_requirement": str(task_data.get("regulatory_requirement", False)).lower(),
+            "sector": task_data.get("sector", sector),
+            "recurring_frequency": task_data.get("recurring_frequency"),
+            "phase_dependency": task_data.get("phase_dependency")
+        }
+        for task_data in generated_tasks
+    ]
+    
+    # Create tasks in database with one batched INSERT; they commit
+    # together with the company update above.
+    # RETURNING makes SQLAlchemy render multi-row VALUES pages
+    # (insertmanyvalues) instead of a row-by-row driver executemany
+    if created_tasks:
+        await db.execute(insert(Task).returning(Task.id), created_tasks)
+    
+    await db.commit()
+    
+    # Create audit log
+    get_audit_queue().enqueue(
+        user_id=current_user.id,
+        action="esg_scoping_completed",
+        resource_type="company",
+        resource_id=str(company_id),
+        details={
+            "sector": sector,
+            "tasks_generated": len(created_tasks),
+            "answers_count": len(answers)
+        },
+        ip_address="unknown"  # TODO: Extract from request
+    )
+    
+    # Dozens of task dicts; orjson encodes them (and dates and str enums)
+    # natively, skipping jsonable_encoder and the stdlib json encoder
+    return ORJSONResponse({
+        "message": "ESG scoping completed successfully",
+        "tasks_generated": len(created_tasks),
+        "sector": sector,
+        "company_id": str(company_id),
+        "tasks": [
+            {
+                "id": task["id"],
+                "title": task["title"],
+                "category": task["category"],
+                "priority": task["priority"],
+                "task_type": task["task_type"],
+                "due_date": task["due_date"],
+                "estimated_hours": task["estimated_hours"],
+                "regulatory_requirement": task["regulatory_requirement"] == "true",
+                "sector": task["sector"],
+                "recurring_frequency": task["recurring_frequency"],
+                "phase_dependency": task["phase_dependency"],
+                "framework_tags": task["framework_tags"],
+                "compliance_context": task["compliance_context"],
+                "action_required": task["action_required"]
+            }
+            for task in created_tasks
+        ]
+    })
+
 
 @router.get("/esg/scoping/{company_id}/status")
 async def get_scoping_status(
     company_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get ESG scoping completion status for a company."""
-    # Verify user has access to company
-    query = select(Company).where(
-        and_(
-            Company.id == company_id,
-            Company.id == current_user.company_id
+    # Verify user has access to company before touching the database
+    if company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found or access denied"
         )
+    
+    # Fetch the status columns and the task counts concurrently
+    query = select(
+        Company.id,
+        Company.data_version,
+        Company.esg_scoping_completed,
+        Company.business_sector,
+        Company.scoping_completed_at
+    ).where(Company.id == company_id)
+    task_count_query = (
+        select(Task.category, Task.status, func.count().label("n"))
+        .where(Task.company_id == company_id)
+        .group_by(Task.category, Task.status)
+        .order_by(Task.category, Task.status)
     )
-    result = await db.execute(query)
-    company = result.scalar_one_or_none()
+    result, task_count_result = await execute_concurrently(query, task_count_query)
+    company = result.one_or_none()
     
     if not company:
         raise HTTPException(
@@ -269,24 +261,27 @@ async def get_scoping_status(
             detail="Company not found or access denied"
         )
     
-    # Get task counts by category
-    task_query = select(Task).where(Task.company_id == company_id)
-    task_result = await db.execute(task_query)
-    tasks = task_result.scalars().all()
+    task_counts = task_count_result.all()
     
-    # Calculate progress metrics
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
+    # Task writes bump the company's data version too
+    etag = make_etag(company.id, company.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
+    # Calculate progress metrics from the per-category/status counts
+    total_tasks = 0
+    completed_tasks = 0
     category_stats = {}
-    for task in tasks:
-        category = task.category
+    for category, task_status, n in task_counts:
         if category not in category_stats:
             category_stats[category] = {"total": 0, "completed": 0}
         
-        category_stats[category]["total"] += 1
-        if task.status == TaskStatus.COMPLETED:
-            category_stats[category]["completed"] += 1
+        category_stats[category]["total"] += n
+        total_tasks += n
+        if task_status == TaskStatus.COMPLETED:
+            category_stats[category]["completed"] += n
+            completed_tasks += n
     
     return {
         "company_id": str(company_id),
@@ -316,15 +311,26 @@ async def get_scoping_data_for_editing(
     Returns the current scoping data, task summary, and sector information
     to populate the editing interface.
     """
-    # Verify user has access to company
-    query = select(Company).where(
-        and_(
-            Company.id == company_id,
-            Company.id == current_user.company_id
+    # Verify user has access to company before touching the database
+    if company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found or access denied"
         )
+    
+    query = select(
+        Company.scoping_data,
+        Company.business_sector,
+        Company.esg_scoping_completed,
+        Company.scoping_completed_at
+    ).where(Company.id == company_id)
+    task_count_query = (
+        select(Task.category, Task.status, func.count().label("n"))
+        .where(Task.company_id == company_id)
+        .group_by(Task.category, Task.status)
     )
-    result = await db.execute(query)
-    company = result.scalar_one_or_none()
+    result, task_count_result = await execute_concurrently(query, task_count_query)
+    company = result.one_or_none()
     
     if not company:
         raise HTTPException(
@@ -332,29 +338,25 @@ async def get_scoping_data_for_editing(
             detail="Company not found or access denied"
         )
     
-    # Get current tasks
-    task_query = select(Task).where(Task.company_id == company_id)
-    task_result = await db.execute(task_query)
-    tasks = task_result.scalars().all()
-    
-    # Summarize current state
+    # Summarize current state from the per-category/status counts
     task_summary = {
-        "total": len(tasks),
-        "completed": len([t for t in tasks if t.status == TaskStatus.COMPLETED]),
-        "in_progress": len([t for t in tasks if t.status == TaskStatus.IN_PROGRESS]),
-        "todo": len([t for t in tasks if t.status == TaskStatus.TODO]),
+        "total": 0,
+        "completed": 0,
+        "in_progress": 0,
+        "todo": 0,
         "by_category": {}
     }
     
-    for task in tasks:
-        category = task.category.value
-        if category not in task_summary["by_category"]:
-            task_summary["by_category"][category] = {
-                "total": 0, "completed": 0, "in_progress": 0, "todo": 0
-            }
+    for category, task_status, n in task_count_result.all():
+        category_summary = task_summary["by_category"].setdefault(
+            category.value, {"total": 0, "completed": 0, "in_progress": 0, "todo": 0}
+        )
+        category_summary["total"] += n
+        category_summary[task_status.value] = category_summary.get(task_status.value, 0) + n
         
-        task_summary["by_category"][category]["total"] += 1
-        task_summary["by_category"][category][task.status.value] += 1
+        task_summary["total"] += n
+        if task_status.value in task_summary:
+            task_summary[task_status.value] += n
     
     return {
         "company_id": str(company_id),
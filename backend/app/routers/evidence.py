@@ -1,28 +1,41 @@
 """
 Evidence management router for file uploads and downloads.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, status
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from uuid import uuid4
 import os
+import asyncio
 import hashlib
-import shutil
+import logging
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple
 
-from ..database import get_db
+from ..database import get_db, execute_concurrently
 from ..auth.dependencies import get_current_user
+from ..core.audit_queue import get_audit_queue
+from ..core.data_version import bump_data_version
 from ..models import Evidence, Task, User
-from ..schemas.evidence import EvidenceResponse, EvidenceCreate
+from ..schemas.evidence import EvidenceResponse, EvidenceListResponse, EvidenceCreate
 from ..config import settings
 
+# Handle optional python-magic dependency (needs the libmagic system library)
+try:
+    import magic
+    MAGIC_AVAILABLE = True
+except ImportError:
+    MAGIC_AVAILABLE = False
+    magic = None
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Allowed file types and sizes
-ALLOWED_EXTENSIONS = {
+ALLOWED_EXTENSIONS = frozenset({
     'application/pdf',
     'image/jpeg', 
     'image/png',
@@ -30,22 +43,61 @@ ALLOWED_EXTENSIONS = {
     'application/vnd.openxmlformats-officedocument.wordprocessingml.document',  # docx
     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',  # xlsx
     'text/csv'
-}
+})
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+SNIFF_BYTES = 4096
+
+# Sniffed types that are acceptable for a declared type libmagic can't
+# pin down from the header alone (Office files are ZIP containers, CSV is
+# plain text)
+SNIFF_EQUIVALENTS = {
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': frozenset({'application/zip'}),
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': frozenset({'application/zip'}),
+    'text/csv': frozenset({'text/plain'}),
+    'image/jpg': frozenset({'image/jpeg'}),
+}
+
+def sniff_content_type(source: BinaryIO) -> Optional[str]:
+    """Detect a file's MIME type from its first bytes, leaving it rewound."""
+    if not MAGIC_AVAILABLE:
+        return None
+    head = source.read(SNIFF_BYTES)
+    source.seek(0)
+    return magic.from_buffer(head, mime=True)
 
-def validate_file(file: UploadFile) -> None:
-    """Validate uploaded file type and size."""
+def validate_file(file: UploadFile, sniffed_type: Optional[str] = None) -> str:
+    """
+    Validate uploaded file type and size.
+    
+    Returns the content type to store: the sniffed type when the file's
+    contents identify it, otherwise the client-declared type.
+    """
     if file.content_type not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File type {file.content_type} not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
+    if (
+        sniffed_type is not None
+        and sniffed_type != file.content_type
+        and sniffed_type not in SNIFF_EQUIVALENTS.get(file.content_type, ())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File contents ({sniffed_type}) do not match declared type {file.content_type}"
+        )
+    
     if file.size and file.size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File size too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
         )
+    
+    if sniffed_type in ALLOWED_EXTENSIONS:
+        return sniffed_type
+    return file.content_type
 
 async def verify_task_access(
     task_id: str, 
@@ -71,13 +123,54 @@ async def verify_task_access(
     
     return task
 
+async def get_accessible_evidence(
+    evidence_id: str,
+    user: User,
+    db: AsyncSession
+) -> Evidence:
+    """Get evidence whose task belongs to the user's company."""
+    query = (
+        select(Evidence)
+        .join(Task, Evidence.task_id == Task.id)
+        .where(
+            and_(
+                Evidence.id == evidence_id,
+                Task.company_id == user.company_id  # Site-scoped access
+            )
+        )
+    )
+    result = await db.execute(query)
+    evidence = result.scalar_one_or_none()
+    
+    if not evidence:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evidence not found or access denied"
+        )
+    
+    return evidence
+
 def calculate_file_hash(file_path: str) -> str:
     """Calculate SHA-256 hash of file for integrity verification."""
-    hash_sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def save_upload(source: BinaryIO, file_path: Path) -> Tuple[str, int]:
+    """Write an uploaded file to disk, hashing it in the same pass."""
+    hash_sha256 = hashlib.sha256()
+    size = 0
+    with open(file_path, "wb") as buffer:
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            buffer.write(chunk)
             hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+            size += len(chunk)
+    return hash_sha256.hexdigest(), size
+
+async def verify_file_hash(file_path: Path, expected_hash: str, evidence_id: str) -> None:
+    """Re-hash a stored evidence file and log it if the contents changed."""
+    current_hash = await asyncio.to_thread(calculate_file_hash, str(file_path))
+    if current_hash != expected_hash:
+        logger.error(f"Integrity check failed for evidence {evidence_id}: {file_path}")
 
 def ensure_upload_directory(task_id: str) -> Path:
     """Ensure upload directory exists for task."""
@@ -96,15 +189,17 @@ async def upload_evidence(
     Upload evidence file for a task.
     
     Security features:
-    - File type validation
+    - File type validation against the file's sniffed contents
     - File size limits
     - Secure filename generation
     - SHA-256 integrity verification
     - Site-scoped access control
     - Audit logging
     """
-    # Validate file
-    validate_file(file)
+    # Validate file before anything touches the disk; sniffing reads only
+    # the first few KB of the spooled upload
+    sniffed_type = await asyncio.to_thread(sniff_content_type, file.file)
+    content_type = validate_file(file, sniffed_type)
     
     # Verify task access
     task = await verify_task_access(task_id, current_user, db)
@@ -114,16 +209,12 @@ async def upload_evidence(
     secure_filename = f"{uuid4()}{file_extension}"
     
     # Ensure upload directory exists
-    upload_dir = ensure_upload_directory(task_id)
+    upload_dir = await asyncio.to_thread(ensure_upload_directory, task_id)
     file_path = upload_dir / secure_filename
     
     try:
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Calculate file hash for integrity
-        file_hash = calculate_file_hash(str(file_path))
+        # Save file and calculate its hash for integrity in one pass
+        file_hash, file_size = await asyncio.to_thread(save_upload, file.file, file_path)
         
         # Create evidence record
         evidence = Evidence(
@@ -133,17 +224,16 @@ async def upload_evidence(
             file_hash=file_hash,
             uploaded_by=current_user.id,
             uploaded_at=datetime.utcnow(),
-            file_size=file.size or os.path.getsize(file_path),
-            mime_type=file.content_type or "application/octet-stream"
+            file_size=file_size,
+            mime_type=content_type
         )
         
         db.add(evidence)
+        await bump_data_version(db, task.company_id)
         await db.commit()
-        await db.refresh(evidence)
         
         # Create audit log entry
-        from ..models.audit import AuditLog
-        audit_log = AuditLog(
+        get_audit_queue().enqueue(
             user_id=current_user.id,
             action="evidence_upload",
             resource_type="evidence",
@@ -154,80 +244,76 @@ async def upload_evidence(
                 "file_size": evidence.file_size,
                 "file_hash": file_hash
             },
-            timestamp=datetime.utcnow(),
             ip_address="unknown"  # TODO: Extract from request
         )
-        db.add(audit_log)
-        await db.commit()
         
         return evidence
         
-    except Exception as e:
-        # Clean up file if database operation fails
-        if file_path.exists():
-            file_path.unlink()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload file: {str(e)}"
-        )
+    except Exception:
+        # Clean up file if database operation fails; the error itself is
+        # logged and sanitized by the app's exception handlers
+        await asyncio.to_thread(file_path.unlink, missing_ok=True)
+        raise
 
-@router.get("/tasks/{task_id}/evidence", response_model=List[EvidenceResponse])
+@router.get("/tasks/{task_id}/evidence", response_model=EvidenceListResponse)
 async def get_task_evidence(
     task_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all evidence files for a task."""
+    """Get a page of evidence files for a task, newest first."""
     # Verify task access
     task = await verify_task_access(task_id, current_user, db)
     
-    # Get evidence for task
-    query = select(Evidence).where(Evidence.task_id == task_id)
-    result = await db.execute(query)
-    evidence_list = result.scalars().all()
+    # Get the page as plain rows (the response model validates the
+    # mappings directly, so no ORM objects are built) and the total count
+    # concurrently, on separate pooled sessions
+    page_result, count_result = await execute_concurrently(
+        select(Evidence.__table__)
+        .where(Evidence.task_id == task_id)
+        .order_by(Evidence.created_at.desc())
+        .offset(skip)
+        .limit(limit),
+        select(func.count()).select_from(Evidence).where(Evidence.task_id == task_id)
+    )
     
-    return evidence_list
+    return {
+        "evidence": page_result.mappings().all(),
+        "total_count": count_result.scalar_one(),
+        "skip": skip,
+        "limit": limit
+    }
 
 @router.get("/evidence/{evidence_id}")
 async def download_evidence(
     evidence_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Download evidence file."""
-    # Get evidence record
-    query = select(Evidence).where(Evidence.id == evidence_id)
-    result = await db.execute(query)
-    evidence = result.scalar_one_or_none()
-    
-    if not evidence:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Evidence not found"
-        )
-    
-    # Verify task access
-    await verify_task_access(evidence.task_id, current_user, db)
+    # Get evidence record, checking task access in the same query
+    evidence = await get_accessible_evidence(evidence_id, current_user, db)
     
-    # Check if file exists
+    # Check if file exists; the stat result is handed to FileResponse so
+    # the file is not stat'ed a second time when the response is sent
     file_path = Path(settings.evidence_storage_path) / evidence.file_path
-    if not file_path.exists():
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk"
         )
     
-    # Verify file integrity
-    current_hash = calculate_file_hash(str(file_path))
-    if current_hash != evidence.file_hash:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="File integrity check failed"
-        )
+    # Verify file integrity after the response is sent; re-hashing up to
+    # 50MB inline would delay every download
+    background_tasks.add_task(verify_file_hash, file_path, evidence.file_hash, str(evidence.id))
     
     # Create audit log entry
-    from ..models.audit import AuditLog
-    audit_log = AuditLog(
+    get_audit_queue().enqueue(
         user_id=current_user.id,
         action="evidence_download",
         resource_type="evidence",
@@ -236,16 +322,14 @@ async def download_evidence(
             "task_id": str(evidence.task_id),
             "filename": evidence.original_filename
         },
-        timestamp=datetime.utcnow(),
         ip_address="unknown"  # TODO: Extract from request
     )
-    db.add(audit_log)
-    await db.commit()
     
     return FileResponse(
         path=str(file_path),
         filename=evidence.original_filename,
-        media_type=evidence.mime_type
+        media_type=evidence.mime_type,
+        stat_result=stat_result
     )
 
 @router.delete("/evidence/{evidence_id}")
@@ -255,19 +339,8 @@ async def delete_evidence(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete evidence file."""
-    # Get evidence record
-    query = select(Evidence).where(Evidence.id == evidence_id)
-    result = await db.execute(query)
-    evidence = result.scalar_one_or_none()
-    
-    if not evidence:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Evidence not found"
-        )
-    
-    # Verify task access
-    await verify_task_access(evidence.task_id, current_user, db)
+    # Get evidence record, checking task access in the same query
+    evidence = await get_accessible_evidence(evidence_id, current_user, db)
     
     # Check if user can delete (only uploader or admin)
     if evidence.uploaded_by != current_user.id and current_user.role != "admin":
@@ -276,37 +349,26 @@ async def delete_evidence(
             detail="You can only delete files you uploaded"
         )
     
-    try:
-        # Delete file from disk
-        file_path = Path(settings.evidence_storage_path) / evidence.file_path
-        if file_path.exists():
-            file_path.unlink()
-        
-        # Delete database record
-        await db.delete(evidence)
-        await db.commit()
-        
-        # Create audit log entry
-        from ..models.audit import AuditLog
-        audit_log = AuditLog(
-            user_id=current_user.id,
-            action="evidence_delete",
-            resource_type="evidence",
-            resource_id=str(evidence.id),
-            details={
-                "task_id": str(evidence.task_id),
-                "filename": evidence.original_filename
-            },
-            timestamp=datetime.utcnow(),
-            ip_address="unknown"  # TODO: Extract from request
-        )
-        db.add(audit_log)
-        await db.commit()
-        
-        return {"message": "Evidence deleted successfully"}
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete evidence: {str(e)}"
-        )
\ No newline at end of file
+    # Delete file from disk
+    file_path = Path(settings.evidence_storage_path) / evidence.file_path
+    await asyncio.to_thread(file_path.unlink, missing_ok=True)
+    
+    # Delete database record
+    await db.delete(evidence)
+    await bump_data_version(db, current_user.company_id)
+    await db.commit()
+    
+    # Create audit log entry
+    get_audit_queue().enqueue(
+        user_id=current_user.id,
+        action="evidence_delete",
+        resource_type="evidence",
+        resource_id=str(evidence.id),
+        details={
+            "task_id": str(evidence.task_id),
+            "filename": evidence.original_filename
+        },
+        ip_address="unknown"  # TODO: Extract from request
+    )
+    
+    return {"message": "Evidence deleted successfully"}
@@ -4,10 +4,12 @@ Task management router for ESG compliance.
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from datetime import date
+from sqlalchemy import select, exists, func, and_, or_, cast, String
+from sqlalchemy.orm import selectinload
+from datetime import date, datetime
+import orjson
 
-from ..database import get_db
+from ..database import get_db, execute_concurrently
 from ..schemas.tasks import (
     TaskResponse, 
     TaskListResponse,
@@ -24,6 +26,7 @@ from ..auth.dependencies import (
     require_manager,
     create_audit_log
 )
+from ..core.data_version import bump_data_version
 from ..core.task_generator import TaskGenerator
 
 router = APIRouter()
@@ -57,7 +60,12 @@ async def get_tasks(
         if location_id:
             filters.append(Task.location_id == location_id)
         if framework_tag:
-            filters.append(Task.framework_tags.contains([framework_tag]))
+            # Tags are stored as a JSON list; match the quoted tag in its text
+            filters.append(
+                cast(Task.framework_tags, String).contains(
+                    orjson.dumps(framework_tag).decode(), autoescape=True
+                )
+            )
         if due_before:
             filters.append(Task.due_date <= due_before)
         if due_after:
@@ -75,42 +83,32 @@ async def get_tasks(
                     )
                 )
         
-        # Get tasks with pagination
-        tasks_result = await db.execute(
+        # Get the task page (with evidence batched into one query) and the
+        # per-status counts concurrently, on separate pooled sessions
+        tasks_result, status_count_result = await execute_concurrently(
             select(Task)
+            .options(selectinload(Task.evidence))
             .where(and_(*filters))
             .order_by(Task.created_at.desc())
             .offset(skip)
-            .limit(limit)
-        )
-        tasks = tasks_result.scalars().all()
-        
-        # Get total count
-        count_result = await db.execute(
-            select(func.count(Task.id))
+            .limit(limit),
+            select(Task.status, func.count(Task.id))
             .where(and_(*filters))
+            .group_by(Task.status)
         )
-        total_count = count_result.scalar()
+        tasks = tasks_result.scalars().all()
         
-        # Get status counts
+        # Derive the total and status counts from the grouped rows
         status_counts = {}
-        for task_status in TaskStatus:
-            status_filters = filters + [Task.status == task_status]
-            status_result = await db.execute(
-                select(func.count(Task.id))
-                .where(and_(*status_filters))
-            )
-            status_counts[task_status.value] = status_result.scalar()
+        total_count = 0
+        for task_status, count in status_count_result.all():
+            if task_status is not None:
+                status_counts[task_status.value] = count
+            total_count += count
         
         # Convert to response format
         task_responses = []
         for task in tasks:
-            # Get evidence for task
-            evidence_result = await db.execute(
-                select(Evidence).where(Evidence.task_id == task.id)
-            )
-            evidence = evidence_result.scalars().all()
-            
             task_responses.append(TaskResponse(
                 id=task.id,
                 company_id=task.company_id,
@@ -138,7 +136,7 @@ async def get_tasks(
                         "uploaded_at": ev.uploaded_at,
                         "file_hash": ev.file_hash,
                         "description": ev.description
-                    } for ev in evidence
+                    } for ev in task.evidence
                 ]
             ))
         
@@ -267,15 +265,13 @@ async def update_task(
         
         # Set completion timestamp if status changed to completed
         if task_update.status == TaskStatus.COMPLETED:
-            from datetime import datetime
             task.completed_at = datetime.utcnow()
         
+        await bump_data_version(db, task.company_id)
         await db.commit()
-        await db.refresh(task)
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=current_user.id,
             action="task_update",
             resource_type="task",
@@ -318,30 +314,29 @@ async def assign_task(
 ):
     """Assign a task to a user (Manager/Admin only)."""
     try:
+        # Fetch the task and check the assignee belongs to the same company
+        # in one round-trip
+        assignee_in_company = exists().where(
+            User.id == assignment.assigned_user_id,
+            User.company_id == current_user.company_id
+        )
         result = await db.execute(
-            select(Task)
+            select(Task, assignee_in_company.label("assignee_in_company"))
             .where(
                 Task.id == task_id,
                 Task.company_id == current_user.company_id
             )
         )
-        task = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not task:
+        if not row:
             raise HTTPException(status_code=404, detail="Task not found")
         
+        task = row.Task
+        
         # Verify assigned user belongs to same company
         if assignment.assigned_user_id:
-            user_result = await db.execute(
-                select(User)
-                .where(
-                    User.id == assignment.assigned_user_id,
-                    User.company_id == current_user.company_id
-                )
-            )
-            assigned_user = user_result.scalar_one_or_none()
-            
-            if not assigned_user:
+            if not row.assignee_in_company:
                 raise HTTPException(
                     status_code=400, 
                     detail="Assigned user not found in company"
@@ -351,12 +346,11 @@ async def assign_task(
         task.assigned_user_id = assignment.assigned_user_id
         task.location_id = assignment.location_id
         
+        await bump_data_version(db, task.company_id)
         await db.commit()
-        await db.refresh(task)
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=current_user.id,
             action="task_assign",
             resource_type="task",
@@ -412,9 +406,9 @@ async def generate_tasks(
         if generation_request.regenerate:
             # Get company to get sector
             company_result = await db.execute(
-                select(Company).where(Company.id == generation_request.company_id)
+                select(Company.business_sector).where(Company.id == generation_request.company_id)
             )
-            company = company_result.scalar_one_or_none()
+            company = company_result.one_or_none()
             
             if not company:
                 raise HTTPException(status_code=404, detail="Company not found")
@@ -433,8 +427,7 @@ async def generate_tasks(
             )
         
         # Create audit log
-        await create_audit_log(
-            db=db,
+        create_audit_log(
             user_id=current_user.id,
             action="tasks_generate",
             resource_type="task",
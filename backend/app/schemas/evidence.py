@@ -3,7 +3,7 @@ Pydantic schemas for evidence management.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class EvidenceBase(BaseModel):
@@ -31,6 +31,14 @@ class EvidenceResponse(EvidenceBase):
         from_attributes = True
 
 
+class EvidenceListResponse(BaseModel):
+    """Schema for a page of a task's evidence with the overall count."""
+    evidence: List[EvidenceResponse]
+    total_count: int
+    skip: int
+    limit: int
+
+
 class EvidenceUpdate(BaseModel):
     """Schema for updating evidence metadata."""
     original_filename: Optional[str] = None
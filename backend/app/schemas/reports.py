@@ -0,0 +1,83 @@
+"""
+Pydantic schemas for report analytics and previews.
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..models.company import BusinessSector
+
+
+class CompletionCounts(BaseModel):
+    """Task totals for one category or framework."""
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class TaskStatistics(BaseModel):
+    """Task statistics shared by analytics, previews and PDF reports."""
+    total_tasks: int
+    completion_rate: float
+    status_breakdown: Dict[str, int]
+    category_breakdown: Dict[str, CompletionCounts]
+    framework_coverage: Dict[str, CompletionCounts]
+    overdue_tasks: int
+    # Omitted when the company has no tasks
+    completed_tasks: Optional[int] = None
+    in_progress_tasks: Optional[int] = None
+    pending_tasks: Optional[int] = None
+
+
+class AnalyticsCompanyInfo(BaseModel):
+    """Company summary shown on the analytics dashboard."""
+    name: str
+    sector: Optional[BusinessSector] = None
+    esg_scoping_completed: Optional[bool] = None
+    scoping_completed_at: Optional[datetime] = None
+
+
+class RecentActivity(BaseModel):
+    """Evidence and framework totals for the analytics dashboard."""
+    total_evidence_files: int
+    frameworks_applicable: int
+
+
+class CompanyAnalytics(BaseModel):
+    """Schema for company dashboard analytics."""
+    company_info: AnalyticsCompanyInfo
+    task_statistics: TaskStatistics
+    framework_coverage: Dict[str, CompletionCounts]
+    category_breakdown: Dict[str, CompletionCounts]
+    recent_activity: RecentActivity
+
+
+class PreviewCompany(BaseModel):
+    """Company summary shown in a report preview."""
+    name: str
+    sector: Optional[BusinessSector] = None
+    main_location: Optional[str] = None
+
+
+class ScopingSummary(BaseModel):
+    """ESG scoping status included in a report preview."""
+    completed: Optional[bool] = None
+    completed_at: Optional[datetime] = None
+    sector: Optional[BusinessSector] = None
+    total_answers: int
+    preferences: Dict[str, Any]
+
+
+class EvidenceSummary(BaseModel):
+    """Evidence totals included in a report preview."""
+    total_files: int
+    tasks_with_evidence: int
+
+
+class ReportPreview(BaseModel):
+    """Schema for the data a generated report will contain."""
+    company: PreviewCompany
+    statistics: TaskStatistics
+    frameworks: List[str]
+    scoping_summary: ScopingSummary
+    task_counts_by_category: Dict[str, int]
+    evidence_summary: EvidenceSummary
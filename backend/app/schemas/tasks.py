@@ -2,11 +2,20 @@
 Task and evidence schemas for API serialization.
 """
 from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, date
+import enum
 
 from ..models.tasks import TaskStatus, TaskCategory
 
+# Plain-string mirrors of the task enums for response models, so serializing
+# large task lists validates against interned literals instead of building
+# enum members. Keep in sync with models.tasks.
+TaskStatusLiteral = Literal["todo", "in_progress", "completed", "blocked"]
+TaskCategoryLiteral = Literal[
+    "environmental", "social", "governance", "energy", "water", "waste", "supply_chain"
+]
+
 
 class TaskBase(BaseModel):
     """Base task schema."""
@@ -71,7 +80,8 @@ class TaskResponse(TaskBase):
     id: str
     company_id: str
     location_id: Optional[str]
-    status: TaskStatus
+    category: TaskCategoryLiteral
+    status: TaskStatusLiteral
     assigned_user_id: Optional[str]
     framework_tags: List[str]
     completed_at: Optional[datetime]
@@ -81,6 +91,11 @@ class TaskResponse(TaskBase):
     # Related data
     evidence: Optional[List[EvidenceResponse]] = []
     
+    @validator('status', 'category', pre=True)
+    def enum_to_value(cls, v):
+        # ORM rows carry enum members; compare their plain string values
+        return v.value if isinstance(v, enum.Enum) else v
+    
     class Config:
         from_attributes = True
 
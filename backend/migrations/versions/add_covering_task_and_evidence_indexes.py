@@ -0,0 +1,28 @@
+"""Add covering task breakdown index and evidence task_id index
+
+Revision ID: add_covering_task_and_evidence_indexes
+Revises: framework_tags_repr_to_json
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_covering_task_and_evidence_indexes'
+down_revision = 'framework_tags_repr_to_json'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (company_id, category, status) also serves every (company_id, category)
+    # lookup, so it replaces the two-column index
+    op.create_index('ix_tasks_company_category_status', 'tasks', ['company_id', 'category', 'status'])
+    op.drop_index('ix_tasks_company_category', table_name='tasks')
+    op.create_index('ix_evidence_task_id', 'evidence', ['task_id'])
+
+
+def downgrade():
+    op.drop_index('ix_evidence_task_id', table_name='evidence')
+    op.create_index('ix_tasks_company_category', 'tasks', ['company_id', 'category'])
+    op.drop_index('ix_tasks_company_category_status', table_name='tasks')
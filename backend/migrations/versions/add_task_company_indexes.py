@@ -0,0 +1,24 @@
+"""Add company-scoped composite indexes on tasks
+
+Revision ID: add_task_company_indexes
+Revises: cascade_child_foreign_keys
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_company_indexes'
+down_revision = 'cascade_child_foreign_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_tasks_company_status', 'tasks', ['company_id', 'status'])
+    op.create_index('ix_tasks_company_category', 'tasks', ['company_id', 'category'])
+
+
+def downgrade():
+    op.drop_index('ix_tasks_company_category', table_name='tasks')
+    op.drop_index('ix_tasks_company_status', table_name='tasks')
@@ -0,0 +1,46 @@
+"""Add ON DELETE CASCADE to company and meter child foreign keys
+
+Revision ID: cascade_child_foreign_keys
+Revises: fixed_width_id_columns
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'cascade_child_foreign_keys'
+down_revision = 'fixed_width_id_columns'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table) for foreign keys that gain ON DELETE CASCADE
+CASCADE_FOREIGN_KEYS = [
+    ('esg_scoping_responses', 'company_id', 'companies'),
+    ('utility_meters', 'company_id', 'companies'),
+    ('consumption_records', 'meter_id', 'utility_meters'),
+    ('framework_registrations', 'company_id', 'companies'),
+]
+
+
+def _fk_name(table, column, referred_table):
+    # Matches the "fk" entry of the metadata naming convention
+    return f'fk_{table}_{column}_{referred_table}'
+
+
+def _recreate_foreign_keys(ondelete):
+    for table, column, referred_table in CASCADE_FOREIGN_KEYS:
+        name = _fk_name(table, column, referred_table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(
+                name, referred_table, [column], ['id'],
+                ondelete=ondelete
+            )
+
+
+def upgrade():
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _recreate_foreign_keys(None)
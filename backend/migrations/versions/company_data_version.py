@@ -0,0 +1,27 @@
+"""Add a per-company data version counter
+
+Revision ID: company_data_version
+Revises: timestamp_server_defaults
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'company_data_version'
+down_revision = 'timestamp_server_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'companies',
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('companies') as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,65 @@
+"""Convert JSON columns to JSONB
+
+Revision ID: convert_json_columns_to_jsonb
+Revises: add_esg_task_fields
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'convert_json_columns_to_jsonb'
+down_revision = 'add_esg_task_fields'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs stored as JSONB on Postgres
+JSON_COLUMNS = [
+    ('companies', 'scoping_data'),
+    ('esg_scoping_responses', 'answers'),
+    ('esg_scoping_responses', 'preferences'),
+    ('esg_scoping_responses', 'location_data'),
+    ('esg_scoping_responses', 'framework_compliance'),
+    ('framework_registrations', 'registration_data'),
+]
+
+
+def upgrade():
+    # SQLite has no JSONB; the generic JSON columns stay as they are
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=JSONB(),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+    op.create_index(
+        'ix_companies_scoping_data_gin', 'companies', ['scoping_data'],
+        postgresql_using='gin',
+        postgresql_ops={'scoping_data': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_esg_answers_gin', 'esg_scoping_responses', ['answers'],
+        postgresql_using='gin',
+        postgresql_ops={'answers': 'jsonb_path_ops'}
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_esg_answers_gin', table_name='esg_scoping_responses')
+    op.drop_index('ix_companies_scoping_data_gin', table_name='companies')
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json'
+        )
@@ -0,0 +1,23 @@
+"""Index esg_scoping_responses by company
+
+Revision ID: esg_scoping_company_index
+Revises: framework_tags_to_json
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'esg_scoping_company_index'
+down_revision = 'framework_tags_to_json'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # tasks.company_id is already served by the prefix of ix_tasks_company_status
+    op.create_index('ix_esg_scoping_responses_company_id', 'esg_scoping_responses', ['company_id'])
+
+
+def downgrade():
+    op.drop_index('ix_esg_scoping_responses_company_id', table_name='esg_scoping_responses')
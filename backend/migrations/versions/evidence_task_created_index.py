@@ -0,0 +1,25 @@
+"""Replace evidence task_id index with (task_id, created_at)
+
+Revision ID: evidence_task_created_index
+Revises: add_covering_task_and_evidence_indexes
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'evidence_task_created_index'
+down_revision = 'add_covering_task_and_evidence_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves paginated newest-first listings; task_id lookups use its prefix
+    op.create_index('ix_evidence_task_created', 'evidence', ['task_id', 'created_at'])
+    op.drop_index('ix_evidence_task_id', table_name='evidence')
+
+
+def downgrade():
+    op.create_index('ix_evidence_task_id', 'evidence', ['task_id'])
+    op.drop_index('ix_evidence_task_created', table_name='evidence')
@@ -0,0 +1,63 @@
+"""Use fixed-width CHAR(36) for UUID id columns
+
+Revision ID: fixed_width_id_columns
+Revises: convert_json_columns_to_jsonb
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'fixed_width_id_columns'
+down_revision = 'convert_json_columns_to_jsonb'
+branch_labels = None
+depends_on = None
+
+# Primary keys first, then the foreign keys referencing them
+ID_COLUMNS = [
+    ('companies', 'id'),
+    ('users', 'id'),
+    ('tasks', 'id'),
+    ('evidence', 'id'),
+    ('audit_logs', 'id'),
+    ('esg_scoping_responses', 'id'),
+    ('utility_meters', 'id'),
+    ('consumption_records', 'id'),
+    ('framework_registrations', 'id'),
+    ('users', 'company_id'),
+    ('tasks', 'company_id'),
+    ('evidence', 'task_id'),
+    ('evidence', 'uploaded_by'),
+    ('audit_logs', 'user_id'),
+    ('esg_scoping_responses', 'company_id'),
+    ('utility_meters', 'company_id'),
+    ('consumption_records', 'meter_id'),
+    ('consumption_records', 'uploaded_by'),
+    ('framework_registrations', 'company_id'),
+]
+
+
+def upgrade():
+    # SQLite ignores declared column widths; only Postgres needs rewriting
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in ID_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.CHAR(36),
+            postgresql_using=f'{column}::char(36)'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in reversed(ID_COLUMNS):
+        op.alter_column(
+            table, column,
+            type_=sa.String(),
+            postgresql_using=f'{column}::varchar'
+        )
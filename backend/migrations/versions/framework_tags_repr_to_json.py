@@ -0,0 +1,46 @@
+"""Rewrite Python-repr framework_tags values as JSON
+
+Revision ID: framework_tags_repr_to_json
+Revises: add_task_company_indexes
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'framework_tags_repr_to_json'
+down_revision = 'add_task_company_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Scoping used to store str(list), e.g. "['GRI', 'ISO 14001']"
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, framework_tags FROM tasks WHERE framework_tags IS NOT NULL")
+    ).fetchall()
+
+    for task_id, framework_tags in rows:
+        try:
+            json.loads(framework_tags)
+            continue  # Already JSON
+        except ValueError:
+            pass
+        try:
+            tags = ast.literal_eval(framework_tags)
+        except (ValueError, SyntaxError):
+            continue
+        conn.execute(
+            sa.text("UPDATE tasks SET framework_tags = :tags WHERE id = :id"),
+            {"tags": json.dumps(tags), "id": task_id}
+        )
+
+
+def downgrade():
+    # JSON arrays of strings are still readable by the old eval() readers
+    pass
@@ -0,0 +1,39 @@
+"""Store framework_tags as a JSON column
+
+Revision ID: framework_tags_to_json
+Revises: evidence_task_created_index
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'framework_tags_to_json'
+down_revision = 'evidence_task_created_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite keeps the JSON text as is; FastJSON reads it back as a list
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column(
+        'tasks', 'framework_tags',
+        type_=JSONB(),
+        postgresql_using="NULLIF(framework_tags, '')::jsonb"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column(
+        'tasks', 'framework_tags',
+        type_=sa.String(),
+        postgresql_using='framework_tags::text'
+    )
@@ -0,0 +1,73 @@
+"""Generate created_at/updated_at in the database
+
+Revision ID: timestamp_server_defaults
+Revises: esg_scoping_company_index
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'timestamp_server_defaults'
+down_revision = 'esg_scoping_company_index'
+branch_labels = None
+depends_on = None
+
+# Timestamp columns that moved from Python-side defaults to server defaults
+TIMESTAMP_COLUMNS = [
+    ('companies', 'created_at'),
+    ('companies', 'updated_at'),
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('tasks', 'created_at'),
+    ('tasks', 'updated_at'),
+    ('evidence', 'created_at'),
+]
+
+
+def _now_sql(dialect_name):
+    # Mirrors app.models.types.utcnow; SQLite's CURRENT_TIMESTAMP is whole seconds
+    if dialect_name == 'postgresql':
+        return 'now()'
+    if dialect_name == 'sqlite':
+        return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    return 'CURRENT_TIMESTAMP'
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    now = _now_sql(dialect_name)
+
+    # Rows written without a Python-side default since the models changed
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(f'UPDATE {table} SET {column} = {now} WHERE {column} IS NULL')
+
+    for table, column in TIMESTAMP_COLUMNS:
+        if dialect_name == 'postgresql':
+            # Existing values were stored as naive UTC
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(timezone=True),
+                server_default=sa.text(now),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, server_default=sa.text(f'({now})'))
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    for table, column in reversed(TIMESTAMP_COLUMNS):
+        if dialect_name == 'postgresql':
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(),
+                server_default=None,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, server_default=None)
@@ -4,25 +4,25 @@ Pytest configuration and fixtures for ESG platform testing.
 import pytest
 import asyncio
 from typing import AsyncGenerator, Generator
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from faker import Faker
 
+from app import database
+from app.core import audit_queue
 from app.main import app
 from app.database import Base, get_db
-from app.models.company import Company, BusinessSector, Location, LocationType
-from app.auth.models import User
-from app.models.tasks import Task, TaskStatus, TaskCategory, Evidence
+from app.models.company import Company, BusinessSector
+from app.models.user import User, UserRole
+from app.models.tasks import Task, TaskStatus, TaskCategory, TaskPriority
+from app.models.evidence import Evidence
 from app.models.audit import AuditLog
 from app.auth.dependencies import get_password_hash
 
 # Initialize Faker for test data
 fake = Faker()
 
-# Test database URL (in-memory SQLite)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
-
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
@@ -33,12 +33,12 @@ def event_loop() -> Generator:
 
 
 @pytest.fixture(scope="function")
-async def test_engine():
+async def test_engine(tmp_path):
     """Create test database engine."""
+    # File-backed, so the separate sessions opened by execute_concurrently
+    # see the same database
     engine = create_async_engine(
-        TEST_DATABASE_URL,
-        poolclass=StaticPool,
-        connect_args={"check_same_thread": False},
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}",
         echo=False
     )
     
@@ -56,11 +56,14 @@ async def test_engine():
 
 
 @pytest.fixture(scope="function")
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
+async def test_session(test_engine, monkeypatch) -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
     async_session_maker = async_sessionmaker(
         test_engine, class_=AsyncSession, expire_on_commit=False
     )
+    # Helpers that open their own sessions use the test database too
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_session_maker)
+    monkeypatch.setattr(audit_queue, "AsyncSessionLocal", async_session_maker)
     
     async with async_session_maker() as session:
         yield session
@@ -75,7 +78,9 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
     
     app.dependency_overrides[get_db] = override_get_db
     
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    # Unhandled errors come back as the 500 response a real server sends
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     
     app.dependency_overrides.clear()
@@ -85,6 +90,7 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
 async def test_company(test_session: AsyncSession) -> Company:
     """Create a test company."""
     company = Company(
+        id=str(uuid4()),
         name="Test SME Company",
         main_location="Dubai",
         business_sector=BusinessSector.HOSPITALITY,
@@ -99,33 +105,18 @@ async def test_company(test_session: AsyncSession) -> Company:
     return company
 
 
-@pytest.fixture
-async def test_location(test_session: AsyncSession, test_company: Company) -> Location:
-    """Create a test location."""
-    location = Location(
-        company_id=test_company.id,
-        name="Main Hotel",
-        location_type=LocationType.PRIMARY,
-        address="123 Sheikh Zayed Road, Dubai",
-        description="Main hotel location"
-    )
-    test_session.add(location)
-    await test_session.commit()
-    await test_session.refresh(location)
-    return location
-
-
 @pytest.fixture
 async def test_user(test_session: AsyncSession, test_company: Company) -> User:
     """Create a test user."""
     user = User(
+        id=str(uuid4()),
         email="test@testcompany.ae",
         hashed_password=get_password_hash("testpassword123"),
         full_name="Test User",
         is_active=True,
         is_verified=True,
         company_id=test_company.id,
-        role="admin"
+        role=UserRole.ADMIN
     )
     test_session.add(user)
     await test_session.commit()
@@ -137,13 +128,14 @@ async def test_user(test_session: AsyncSession, test_company: Company) -> User:
 async def test_manager_user(test_session: AsyncSession, test_company: Company) -> User:
     """Create a test manager user."""
     user = User(
+        id=str(uuid4()),
         email="manager@testcompany.ae",
         hashed_password=get_password_hash("managerpass123"),
         full_name="Test Manager",
         is_active=True,
         is_verified=True,
         company_id=test_company.id,
-        role="manager"
+        role=UserRole.MANAGER
     )
     test_session.add(user)
     await test_session.commit()
@@ -155,13 +147,14 @@ async def test_manager_user(test_session: AsyncSession, test_company: Company) -
 async def test_contributor_user(test_session: AsyncSession, test_company: Company) -> User:
     """Create a test contributor user."""
     user = User(
+        id=str(uuid4()),
         email="contributor@testcompany.ae",
         hashed_password=get_password_hash("contributorpass123"),
         full_name="Test Contributor",
         is_active=True,
         is_verified=True,
         company_id=test_company.id,
-        role="contributor"
+        role=UserRole.CONTRIBUTOR
     )
     test_session.add(user)
     await test_session.commit()
@@ -170,11 +163,11 @@ async def test_contributor_user(test_session: AsyncSession, test_company: Compan
 
 
 @pytest.fixture
-async def test_task(test_session: AsyncSession, test_company: Company, test_location: Location) -> Task:
+async def test_task(test_session: AsyncSession, test_company: Company) -> Task:
     """Create a test task."""
     task = Task(
+        id=str(uuid4()),
         company_id=test_company.id,
-        location_id=test_location.id,
         title="Implement sustainability policy",
         description="Create and implement a comprehensive sustainability policy",
         compliance_context="Green Key Global: 1.2 Sustainability Policy (I)",
@@ -182,7 +175,7 @@ async def test_task(test_session: AsyncSession, test_company: Company, test_loca
         status=TaskStatus.TODO,
         category=TaskCategory.GOVERNANCE,
         framework_tags=["Green Key Global", "Dubai Sustainable Tourism"],
-        priority="high",
+        priority=TaskPriority.HIGH,
         required_evidence_count=1
     )
     test_session.add(task)
@@ -195,6 +188,7 @@ async def test_task(test_session: AsyncSession, test_company: Company, test_loca
 async def test_completed_task(test_session: AsyncSession, test_company: Company, test_user: User) -> Task:
     """Create a completed test task."""
     task = Task(
+        id=str(uuid4()),
         company_id=test_company.id,
         title="Track electricity consumption",
         description="Monitor monthly electricity usage from DEWA",
@@ -204,7 +198,7 @@ async def test_completed_task(test_session: AsyncSession, test_company: Company,
         category=TaskCategory.ENERGY,
         assigned_user_id=test_user.id,
         framework_tags=["Dubai Sustainable Tourism"],
-        priority="high",
+        priority=TaskPriority.HIGH,
         required_evidence_count=3
     )
     test_session.add(task)
@@ -217,13 +211,13 @@ async def test_completed_task(test_session: AsyncSession, test_company: Company,
 async def test_evidence(test_session: AsyncSession, test_task: Task, test_user: User) -> Evidence:
     """Create test evidence."""
     evidence = Evidence(
+        id=str(uuid4()),
         task_id=test_task.id,
+        filename="sustainability_policy.pdf",
         file_path="evidence/test_file.pdf",
-        original_filename="sustainability_policy.pdf",
-        file_hash="abc123def456",
         uploaded_by=test_user.id,
         file_size=1024000,
-        mime_type="application/pdf"
+        file_type="application/pdf"
     )
     test_session.add(evidence)
     await test_session.commit()
@@ -235,6 +229,7 @@ async def test_evidence(test_session: AsyncSession, test_task: Task, test_user:
 async def test_audit_log(test_session: AsyncSession, test_user: User, test_company: Company) -> AuditLog:
     """Create test audit log."""
     audit_log = AuditLog(
+        id=str(uuid4()),
         user_id=test_user.id,
         action="task_created",
         resource_type="task",
@@ -303,7 +298,7 @@ async def sample_tasks(test_session: AsyncSession, test_company: Company) -> lis
         {
             "title": "Supply chain assessment",
             "category": TaskCategory.SUPPLY_CHAIN,
-            "status": TaskStatus.PENDING_REVIEW,
+            "status": TaskStatus.BLOCKED,
             "frameworks": ["Green Key Global"]
         },
         {
@@ -316,6 +311,7 @@ async def sample_tasks(test_session: AsyncSession, test_company: Company) -> lis
     
     for data in task_data:
         task = Task(
+            id=str(uuid4()),
             company_id=test_company.id,
             title=data["title"],
             description=f"Description for {data['title']}",
@@ -324,7 +320,7 @@ async def sample_tasks(test_session: AsyncSession, test_company: Company) -> lis
             status=data["status"],
             category=data["category"],
             framework_tags=data["frameworks"],
-            priority="medium",
+            priority=TaskPriority.MEDIUM,
             required_evidence_count=1
         )
         test_session.add(task)
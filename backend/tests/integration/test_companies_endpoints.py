@@ -0,0 +1,55 @@
+"""
+Integration tests for company profile and location endpoints.
+"""
+import pytest
+from httpx import AsyncClient
+
+
+class TestCompanyETags:
+    """Conditional GETs must not revalidate stale data after a write."""
+    
+    @pytest.mark.asyncio
+    async def test_profile_etag_changes_after_update(self, client: AsyncClient, auth_headers, test_company):
+        """Test the profile ETag changes when the company is updated."""
+        response = await client.get("/api/companies/me", headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        
+        response = await client.get(
+            "/api/companies/me",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        
+        response = await client.put(
+            "/api/companies/me",
+            json={"name": "Renamed SME Company"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        
+        response = await client.get(
+            "/api/companies/me",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    @pytest.mark.asyncio
+    async def test_locations_etag_changes_after_save(self, client: AsyncClient, auth_headers, test_company):
+        """Test the locations ETag changes when locations are saved."""
+        url = f"/api/companies/{test_company.id}/locations"
+        
+        response = await client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["locations"] == []
+        etag = response.headers["etag"]
+        
+        locations = [{"name": "Main Hotel", "emirate": "Dubai"}]
+        response = await client.post(url, json=locations, headers=auth_headers)
+        assert response.status_code == 200
+        
+        response = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["locations"] == locations
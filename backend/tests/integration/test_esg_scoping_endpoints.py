@@ -2,9 +2,19 @@
 Integration tests for ESG scoping wizard endpoints.
 """
 import pytest
+from datetime import date
 from httpx import AsyncClient
 from unittest.mock import patch
 
+from app.core.markdown_parser import ESGContentParser
+
+
+def build_payload_from_mocks(mock_parser_instance):
+    """Group the mocked questions through the real payload builder."""
+    mock_parser_instance.get_sector_payload.side_effect = (
+        lambda sector: ESGContentParser._build_sector_payload(mock_parser_instance, sector)
+    )
+
 
 class TestESGScopingEndpoints:
     """Integration tests for ESG scoping wizard API endpoints."""
@@ -12,7 +22,7 @@ class TestESGScopingEndpoints:
     @pytest.mark.asyncio
     async def test_get_available_sectors(self, client: AsyncClient):
         """Test getting available business sectors."""
-        with patch('app.routers.esg_scoping.ESGContentParser') as mock_parser:
+        with patch('app.routers.esg_scoping.get_content_parser') as mock_parser:
             mock_parser_instance = mock_parser.return_value
             mock_parser_instance.get_available_sectors.return_value = [
                 'hospitality', 'construction_real_estate', 'manufacturing'
@@ -37,8 +47,9 @@ class TestESGScopingEndpoints:
     @pytest.mark.asyncio
     async def test_get_sector_questions_success(self, client: AsyncClient, auth_headers):
         """Test getting ESG questions for a specific sector."""
-        with patch('app.routers.esg_scoping.ESGContentParser') as mock_parser:
+        with patch('app.routers.esg_scoping.get_content_parser') as mock_parser:
             mock_parser_instance = mock_parser.return_value
+            build_payload_from_mocks(mock_parser_instance)
             mock_parser_instance.parse_sector_questions.return_value = [
                 {
                     "id": 1,
@@ -94,8 +105,9 @@ class TestESGScopingEndpoints:
     @pytest.mark.asyncio
     async def test_get_sector_questions_not_found(self, client: AsyncClient, auth_headers):
         """Test getting questions for non-existent sector."""
-        with patch('app.routers.esg_scoping.ESGContentParser') as mock_parser:
+        with patch('app.routers.esg_scoping.get_content_parser') as mock_parser:
             mock_parser_instance = mock_parser.return_value
+            build_payload_from_mocks(mock_parser_instance)
             mock_parser_instance.parse_sector_questions.side_effect = ValueError("Unknown sector")
             
             response = await client.get("/api/esg/sectors/unknown_sector/questions", headers=auth_headers)
@@ -105,8 +117,9 @@ class TestESGScopingEndpoints:
     @pytest.mark.asyncio
     async def test_get_sector_questions_no_questions(self, client: AsyncClient, auth_headers):
         """Test getting questions when none are available."""
-        with patch('app.routers.esg_scoping.ESGContentParser') as mock_parser:
+        with patch('app.routers.esg_scoping.get_content_parser') as mock_parser:
             mock_parser_instance = mock_parser.return_value
+            build_payload_from_mocks(mock_parser_instance)
             mock_parser_instance.parse_sector_questions.return_value = []
             
             response = await client.get("/api/esg/sectors/hospitality/questions", headers=auth_headers)
@@ -140,7 +153,7 @@ class TestESGScopingEndpoints:
                     "action_required": "Policy document creation",
                     "category": "governance",
                     "priority": "high",
-                    "due_date": "2024-02-15",
+                    "due_date": date(2024, 2, 15),
                     "framework_tags": ["Green Key Global"],
                     "required_evidence_count": 1
                 }
@@ -166,6 +179,29 @@ class TestESGScopingEndpoints:
             assert data["company_id"] == test_company.id
             assert len(data["tasks"]) == 1
     
+    @pytest.mark.asyncio
+    async def test_complete_esg_scoping_due_date_format(self, client: AsyncClient, auth_headers, test_company):
+        """Test generated due dates are returned as the stored datetime."""
+        with patch('app.routers.esg_scoping.TaskGenerator') as mock_generator:
+            mock_generator.return_value.generate_tasks_from_scoping.return_value = [
+                {
+                    "title": "Implement sustainability policy",
+                    "description": "Create comprehensive sustainability policy",
+                    "category": "governance",
+                    "priority": "high",
+                    "due_date": date(2026, 11, 15)
+                }
+            ]
+            
+            response = await client.post(
+                f"/api/esg/scoping/{test_company.id}/complete",
+                json={"sector": "hospitality", "answers": {"1": "yes"}},
+                headers=auth_headers
+            )
+        
+        assert response.status_code == 200
+        assert response.json()["tasks"][0]["due_date"] == "2026-11-15T00:00:00"
+    
     @pytest.mark.asyncio
     async def test_complete_esg_scoping_missing_sector(self, client: AsyncClient, auth_headers, test_company):
         """Test ESG scoping completion without sector."""
@@ -246,6 +282,44 @@ class TestESGScopingEndpoints:
         assert progress["completion_percentage"] >= 0
         assert progress["completion_percentage"] <= 100
     
+    @pytest.mark.asyncio
+    async def test_etags_change_after_scoping_complete(self, client: AsyncClient, auth_headers, test_company):
+        """Test status and profile ETags change once scoping is completed."""
+        status_url = f"/api/esg/scoping/{test_company.id}/status"
+        
+        status_response = await client.get(status_url, headers=auth_headers)
+        assert status_response.status_code == 200
+        assert status_response.json()["scoping_completed"] is False
+        status_etag = status_response.headers["etag"]
+        
+        profile_response = await client.get("/api/companies/me", headers=auth_headers)
+        assert profile_response.status_code == 200
+        profile_etag = profile_response.headers["etag"]
+        
+        with patch('app.routers.esg_scoping.TaskGenerator') as mock_generator:
+            mock_generator.return_value.generate_tasks_from_scoping.return_value = []
+            
+            complete_response = await client.post(
+                f"/api/esg/scoping/{test_company.id}/complete",
+                json={"sector": "hospitality", "answers": {"1": "yes"}},
+                headers=auth_headers
+            )
+            assert complete_response.status_code == 200
+        
+        status_response = await client.get(
+            status_url,
+            headers={**auth_headers, "If-None-Match": status_etag}
+        )
+        assert status_response.status_code == 200
+        assert status_response.json()["scoping_completed"] is True
+        
+        profile_response = await client.get(
+            "/api/companies/me",
+            headers={**auth_headers, "If-None-Match": profile_etag}
+        )
+        assert profile_response.status_code == 200
+        assert profile_response.json()["esg_scoping_completed"] is True
+    
     @pytest.mark.asyncio
     async def test_get_scoping_status_company_not_found(self, client: AsyncClient, auth_headers):
         """Test getting scoping status for non-existent company."""
@@ -274,8 +348,9 @@ class TestESGScopingEndpoints:
         assert len(sectors_data["sectors"]) > 0
         
         # Step 2: Get questions for hospitality sector
-        with patch('app.routers.esg_scoping.ESGContentParser') as mock_parser:
+        with patch('app.routers.esg_scoping.get_content_parser') as mock_parser:
             mock_parser_instance = mock_parser.return_value
+            build_payload_from_mocks(mock_parser_instance)
             mock_parser_instance.parse_sector_questions.return_value = [
                 {
                     "id": 1,
@@ -310,7 +385,7 @@ class TestESGScopingEndpoints:
                     "action_required": "Test action",
                     "category": "governance",
                     "priority": "high",
-                    "due_date": "2024-02-15",
+                    "due_date": date(2024, 2, 15),
                     "framework_tags": ["Green Key Global"],
                     "required_evidence_count": 1
                 }
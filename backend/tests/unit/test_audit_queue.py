@@ -0,0 +1,56 @@
+"""
+Unit tests for the background audit log queue.
+"""
+import pytest
+from sqlalchemy import func, select
+
+from app.core.audit_queue import AuditLogQueue
+from app.models.audit import AuditLog
+
+
+async def count_audit_logs(session) -> int:
+    """Count the audit log rows visible to the session."""
+    return await session.scalar(select(func.count()).select_from(AuditLog))
+
+
+class TestAuditLogQueue:
+    """Test suite for the audit log queue."""
+    
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_drop_batch(self, test_session, test_user):
+        """Test a failing row is skipped without losing the rest of its batch."""
+        queue = AuditLogQueue()
+        batch = [
+            {"id": "a" * 36, "user_id": test_user.id, "action": "task_update"},
+            {"id": "b" * 36, "user_id": test_user.id, "action": None},  # NOT NULL violation
+            {"id": "c" * 36, "user_id": test_user.id, "action": "task_assign"},
+        ]
+        
+        await queue._write(batch)
+        
+        result = await test_session.execute(select(AuditLog.id).order_by(AuditLog.id))
+        assert result.scalars().all() == ["a" * 36, "c" * 36]
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_starts_worker(self, test_session, test_user):
+        """Test entries are written even if start() was never called."""
+        queue = AuditLogQueue()
+        
+        queue.enqueue(user_id=test_user.id, action="user_login")
+        await queue.stop()
+        
+        assert await count_audit_logs(test_session) == 1
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_drops_entries_when_full(self, test_session, test_user, monkeypatch):
+        """Test the queue stays bounded when entries arrive faster than writes."""
+        monkeypatch.setattr("app.core.audit_queue.AUDIT_QUEUE_MAX_SIZE", 2)
+        queue = AuditLogQueue()
+        monkeypatch.setattr(queue, "start", lambda: None)
+        
+        for _ in range(5):
+            queue.enqueue(user_id=test_user.id, action="user_login")
+        
+        assert queue._queue.qsize() == 2
+        await queue.stop()
+        assert await count_audit_logs(test_session) == 2
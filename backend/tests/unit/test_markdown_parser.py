@@ -188,7 +188,30 @@ class TestESGContentParser:
             frameworks = parser.get_sector_frameworks('unknown_sector')
             
             assert frameworks == []
+        
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_get_sector_payload(self, esg_content_sample):
+        """Test grouped sector payload is built once and reused."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as tmp_file:
+            tmp_file.write(esg_content_sample)
+            tmp_file_path = tmp_file.name
+        
+        try:
+            parser = ESGContentParser(tmp_file_path)
+            payload = parser.get_sector_payload('hospitality')
+            questions = parser.parse_sector_questions('hospitality')
+            
+            assert payload['sector'] == 'hospitality'
+            assert payload['total_questions'] == len(questions)
+            assert payload['categories'] == list(payload['questions_by_category'].keys())
+            assert sum(len(qs) for qs in payload['questions_by_category'].values()) == len(questions)
+            assert payload['frameworks'] == parser.get_sector_frameworks('hospitality')
             
+            # Cached payload is returned by reference
+            assert parser.get_sector_payload('hospitality') is payload
+        
         finally:
             os.unlink(tmp_file_path)
     
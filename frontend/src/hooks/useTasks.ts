@@ -80,7 +80,7 @@ export const useGenerateTasks = () => {
 export const useTaskEvidence = (taskId: string) => {
   return useQuery({
     queryKey: ['evidence', taskId],
-    queryFn: () => evidenceAPI.getTaskEvidence(taskId).then(res => res.data),
+    queryFn: () => evidenceAPI.getTaskEvidence(taskId).then(res => res.data.evidence),
     enabled: !!taskId,
   })
 }